@@ -0,0 +1,387 @@
+"""
+Local stand-ins for the Buildium API and the Google Sheets values API.
+
+``FakeServices`` serves both from one ``ThreadingHTTPServer`` on localhost:
+
+- ``/v1/...`` mimics ``api.buildium.com/v1``: paged
+  ``leases/outstandingbalances``, ``leases`` and ``rentals`` listings
+  (with the ``propertyids`` filter) and single ``leases/{id}`` and
+  ``rentals/{id}`` lookups. Every Buildium response can be delayed, and a
+  share of them answered with 429.
+- ``/v4/spreadsheets/...`` mimics the Sheets values API used by the sync:
+  ``values/{range}``, ``values:batchGet``, ``values:batchUpdate`` and
+  ``values/{range}:append`` against an in-memory grid.
+
+Point the sync at it with ``BUILDIUM_BASE_URL=services.buildium_url`` and
+``SHEETS_API_ENDPOINT=services.sheets_url``. Calls are counted per endpoint
+in ``services.calls``.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+DEFAULT_PAGE_LIMIT = 50
+
+
+def _column_index(letters):
+    """
+    Convert a column name (``A``, ``E``, ``AA``) to a zero-based index.
+
+    Args:
+        letters (str): Column letters.
+
+    Returns:
+        int: Column index.
+    """
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def parse_a1(a1_range):
+    """
+    Parse an A1 range such as ``Sheet1!E2:E`` or ``Sheet1!A2``.
+
+    Args:
+        a1_range (str): Range, optionally prefixed with a sheet name.
+
+    Returns:
+        tuple: (first column, first row, last column, last row or None for open-ended).
+    """
+    cells = a1_range.split("!")[-1]
+    match = re.fullmatch(r"([A-Z]+)(\d+)(?::([A-Z]+)(\d*))?", cells)
+    if not match:
+        raise ValueError(f"unsupported range: {a1_range}")
+    first_col = _column_index(match[1])
+    last_col = _column_index(match[3]) if match[3] else first_col
+    last_row = int(match[4]) if match[4] else (None if match[3] else int(match[2]))
+    return first_col, int(match[2]), last_col, last_row
+
+
+class FakeSheet:
+    """
+    In-memory grid holding the values of a single worksheet.
+
+    Rows are 1-based like A1 notation; each row maps column index to value.
+    """
+
+    def __init__(self, rows=None):
+        """
+        Args:
+            rows (dict, optional): Row number to ``{column index: value}``.
+        """
+        self.rows = rows or {}
+        self.lock = threading.Lock()
+
+    def last_row(self):
+        """
+        Returns:
+            int: Highest non-empty row number, or 1 for a sheet with only a header.
+        """
+        return max(self.rows, default=1)
+
+    def read(self, a1_range):
+        """
+        Read a range the way ``values.get`` returns it (trailing blanks trimmed).
+
+        Args:
+            a1_range (str): A1 range.
+
+        Returns:
+            dict: ValueRange body.
+        """
+        first_col, first_row, last_col, last_row = parse_a1(a1_range)
+        with self.lock:
+            last_row = last_row or self.last_row()
+            values = []
+            for row_number in range(first_row, last_row + 1):
+                row = self.rows.get(row_number, {})
+                cells = [row.get(col, "") for col in range(first_col, last_col + 1)]
+                while cells and cells[-1] == "":
+                    cells.pop()
+                values.append(cells)
+        while values and not values[-1]:
+            values.pop()
+        body = {"range": a1_range, "majorDimension": "ROWS"}
+        if values:
+            body["values"] = values
+        return body
+
+    def write(self, a1_range, values):
+        """
+        Overwrite cells starting at the top-left corner of ``a1_range``.
+
+        Args:
+            a1_range (str): A1 range.
+            values (list): Rows of cell values.
+
+        Returns:
+            int: Number of cells written.
+        """
+        first_col, first_row, _, _ = parse_a1(a1_range)
+        cells = 0
+        with self.lock:
+            for i, row in enumerate(values):
+                target = self.rows.setdefault(first_row + i, {})
+                for j, value in enumerate(row):
+                    target[first_col + j] = value
+                    cells += 1
+        return cells
+
+    def append(self, values):
+        """
+        Append rows after the last non-empty row.
+
+        Args:
+            values (list): Rows of cell values.
+
+        Returns:
+            int: First row number written.
+        """
+        with self.lock:
+            start = self.last_row() + 1
+            for i, row in enumerate(values):
+                self.rows[start + i] = {col: value for col, value in enumerate(row) if value != ""}
+        return start
+
+
+class FakeBuildium:
+    """
+    In-memory Buildium data set served by ``FakeServices``.
+    """
+
+    def __init__(self, balances, leases, rentals):
+        """
+        Args:
+            balances (list): Outstanding balance entries, in listing order.
+            leases (dict): Lease ID to lease details.
+            rentals (dict): Property ID to property details.
+        """
+        self.balances = balances
+        self.leases = leases
+        self.rentals = rentals
+        self.leases_by_property = {}
+        for lease in leases.values():
+            self.leases_by_property.setdefault(lease.get("PropertyId"), []).append(lease)
+
+    def handle(self, path, query):
+        """
+        Answer a Buildium GET.
+
+        Args:
+            path (str): Path below ``/v1``.
+            query (dict): Parsed query string (lists of values).
+
+        Returns:
+            tuple: (HTTP status, JSON body).
+        """
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", [str(DEFAULT_PAGE_LIMIT)])[0])
+        property_ids = [int(value) for value in query.get("propertyids", [])]
+
+        if path == "/leases/outstandingbalances":
+            return 200, self.balances[offset:offset + limit]
+        if path == "/leases":
+            if property_ids:
+                items = [lease for pid in property_ids for lease in self.leases_by_property.get(pid, [])]
+            else:
+                items = list(self.leases.values())
+            statuses = query.get("leasestatuses")
+            if statuses:
+                items = [lease for lease in items if lease.get("LeaseStatus", "Active") in statuses]
+            return 200, items[offset:offset + limit]
+        if path == "/rentals":
+            ids = property_ids or list(self.rentals)
+            items = [self.rentals[pid] for pid in ids if pid in self.rentals]
+            return 200, items[offset:offset + limit]
+        match = re.fullmatch(r"/(leases|rentals)/(\d+)", path)
+        if match:
+            source = self.leases if match[1] == "leases" else self.rentals
+            item = source.get(int(match[2]))
+            return (200, item) if item is not None else (404, {"UserMessage": "Not found"})
+        return 404, {"UserMessage": "Not found"}
+
+
+class FakeServices:
+    """
+    Threaded HTTP server hosting the fake Buildium and Sheets APIs.
+
+    Usable as a context manager; the server runs on a daemon thread.
+    """
+
+    def __init__(self, buildium, sheet, latency=0.0, sheets_latency=0.0,
+                 throttle_rate=0.0, retry_after=None, seed=0):
+        """
+        Args:
+            buildium (FakeBuildium): Buildium data set.
+            sheet (FakeSheet): Worksheet served for every spreadsheet ID.
+            latency (float, optional): Seconds added to every Buildium response.
+            sheets_latency (float, optional): Seconds added to every Sheets response.
+            throttle_rate (float, optional): Share of Buildium requests answered with 429.
+            retry_after (float, optional): ``Retry-After`` seconds sent with 429s.
+            seed (int, optional): Seed for the 429 injection.
+        """
+        self.buildium = buildium
+        self.sheet = sheet
+        self.latency = latency
+        self.sheets_latency = sheets_latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.calls = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        Returns:
+            str: Server root URL.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def buildium_url(self):
+        """
+        Returns:
+            str: Value for BUILDIUM_BASE_URL.
+        """
+        return f"{self.url}/v1"
+
+    @property
+    def sheets_url(self):
+        """
+        Returns:
+            str: Value for SHEETS_API_ENDPOINT.
+        """
+        return f"{self.url}/"
+
+    def start(self):
+        """
+        Start serving on a background thread.
+
+        Returns:
+            FakeServices: This instance.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the server and close its socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count(self, key):
+        """
+        Increment the call counter ``key``.
+
+        Args:
+            key (str): Counter name, e.g. ``buildium GET /leases/{id}``.
+        """
+        with self._lock:
+            self.calls[key] += 1
+
+    def _throttle(self):
+        """
+        Returns:
+            bool: Whether the current Buildium request should get a 429.
+        """
+        if not self.throttle_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.throttle_rate
+
+    def _handle_buildium(self, method, path, query):
+        endpoint = re.sub(r"/\d+", "/{id}", path)
+        self.count(f"buildium {method} {endpoint}")
+        if self.latency:
+            time.sleep(self.latency)
+        if self._throttle():
+            self.count("buildium 429")
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else {}
+            return 429, {"UserMessage": "Too many requests"}, headers
+        if method != "GET":
+            return 405, {"UserMessage": "Method not allowed"}, {}
+        status, body = self.buildium.handle(path, query)
+        return status, body, {}
+
+    def _handle_sheets(self, method, path, query, body):
+        match = re.fullmatch(r"/v4/spreadsheets/[^/]+/values(?::(\w+)|/([^:]+)(?::(\w+))?)", path)
+        if not match:
+            return 404, {"error": {"code": 404, "message": "Not found"}}, {}
+        collection_action, a1_range, range_action = match.groups()
+        action = collection_action or range_action or "get"
+        self.count(f"sheets {action}")
+        if self.sheets_latency:
+            time.sleep(self.sheets_latency)
+        if a1_range:
+            a1_range = unquote(a1_range)
+
+        if action == "get" and method == "GET":
+            return 200, self.sheet.read(a1_range), {}
+        if action == "batchGet" and method == "GET":
+            return 200, {"valueRanges": [self.sheet.read(r) for r in query.get("ranges", [])]}, {}
+        if action == "batchUpdate" and method == "POST":
+            cells = sum(self.sheet.write(item["range"], item["values"]) for item in body.get("data", []))
+            return 200, {"totalUpdatedCells": cells, "responses": []}, {}
+        if action == "append" and method == "POST":
+            values = body.get("values", [])
+            start = self.sheet.append(values)
+            return 200, {"updates": {"updatedRange": f"A{start}", "updatedRows": len(values)}}, {}
+        return 400, {"error": {"code": 400, "message": f"unsupported {method} {action}"}}, {}
+
+    def _handler_class(self):
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self, method):
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                if url.path.startswith("/v1/"):
+                    status, payload, headers = services._handle_buildium(method, url.path[len("/v1"):], query)
+                elif url.path.startswith("/v4/"):
+                    status, payload, headers = services._handle_sheets(method, url.path, query, body)
+                else:
+                    status, payload, headers = 404, {}, {}
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+        return Handler
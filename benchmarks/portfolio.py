@@ -0,0 +1,212 @@
+"""
+Synthetic Buildium portfolios for load testing the sync.
+
+``generate_portfolio`` builds Buildium-shaped outstanding-balance entries,
+leases (``CurrentTenants`` with ``PhoneNumbers``) and rentals
+(``Address.AddressLine1``), plus the sheet rows a previous sync would have
+left behind, with configurable churn:
+
+- ``changed_ratio``: share of sheet rows whose balance is stale,
+- ``new_ratio``: share of leases (the newest IDs) not on the sheet yet,
+- ``missing_tenant_ratio``: share of leases without current tenants.
+
+``Portfolio.sheet_rows("steady")`` is the pre-populated sheet;
+``sheet_rows("cold")`` is an empty sheet with only the header, so every
+lease is enriched and appended.
+
+The payloads can also be written out as JSON:
+
+    python benchmarks/portfolio.py --leases 10000 --out /tmp/portfolio
+"""
+
+import argparse
+import json
+import os
+import random
+
+SCENARIOS = ("steady", "cold")
+
+BALANCE_COLUMN = 4
+LEASE_ID_COLUMN = 26
+HEADER = {0: "Tenant", 1: "Address", 2: "Phone", BALANCE_COLUMN: "Outstanding Balance", LEASE_ID_COLUMN: "Lease ID"}
+
+FIRST_NAMES = ("Avery", "Jordan", "Maria", "Wei", "Priya", "Samuel", "Fatima", "Diego", "Hannah", "Kofi")
+LAST_NAMES = ("Nguyen", "Garcia", "Smith", "Okafor", "Patel", "Kim", "Johnson", "Rossi", "Cohen", "Silva")
+STREETS = ("Oak", "Maple", "Cedar", "Pine", "Elm", "Lakeview", "Hillcrest", "Sunset", "Park", "River")
+CITIES = (("Austin", "TX"), ("Denver", "CO"), ("Columbus", "OH"), ("Tampa", "FL"), ("Raleigh", "NC"))
+
+
+class Portfolio:
+    """
+    Generated Buildium data set and the matching sheet state.
+    """
+
+    def __init__(self, balances, leases, rentals, new_lease_ids, stale_balances):
+        """
+        Args:
+            balances (list): Outstanding balance entries, in listing order.
+            leases (dict): Lease ID to lease details.
+            rentals (dict): Property ID to property details.
+            new_lease_ids (set): Leases not yet on the sheet in the steady state.
+            stale_balances (dict): Lease ID to the outdated balance shown on the sheet.
+        """
+        self.balances = balances
+        self.leases = leases
+        self.rentals = rentals
+        self.new_lease_ids = new_lease_ids
+        self.stale_balances = stale_balances
+
+    def sheet_rows(self, scenario="steady"):
+        """
+        Build the sheet as it looks before the sync.
+
+        Args:
+            scenario (str, optional): ``steady`` for a sheet kept up to date
+                by earlier syncs, ``cold`` for an empty sheet.
+
+        Returns:
+            dict: Row number to ``{column index: value}``, row 1 being the header.
+        """
+        if scenario not in SCENARIOS:
+            raise ValueError(f"unknown scenario: {scenario}")
+        rows = {1: dict(HEADER)}
+        if scenario == "cold":
+            return rows
+        row_number = 2
+        for entry in self.balances:
+            lease_id = entry["LeaseId"]
+            if lease_id in self.new_lease_ids:
+                continue
+            lease = self.leases[lease_id]
+            tenants = lease["CurrentTenants"]
+            row = {
+                BALANCE_COLUMN: self.stale_balances.get(lease_id, entry["TotalBalance"]),
+                LEASE_ID_COLUMN: str(lease_id),
+                1: self.rentals[lease["PropertyId"]]["Address"]["AddressLine1"],
+            }
+            if tenants:
+                row[0] = f"{tenants[0]['FirstName']} {tenants[0]['LastName']}"
+                row[2] = tenants[0]["PhoneNumbers"][0]["Number"]
+            rows[row_number] = row
+            row_number += 1
+        return rows
+
+
+def _balance(rng):
+    """
+    Draw an outstanding balance: mostly a few hundred dollars, with a long tail.
+
+    Args:
+        rng (random.Random): Random source.
+
+    Returns:
+        float: Balance rounded to cents.
+    """
+    return round(min(rng.lognormvariate(5.5, 1.0), 25000), 2)
+
+
+def generate_portfolio(leases, changed_ratio=0.05, new_ratio=0.01, missing_tenant_ratio=0.02,
+                       leases_per_property=20, seed=0):
+    """
+    Generate a portfolio of ``leases`` leases with an outstanding balance.
+
+    Args:
+        leases (int): Number of leases in the outstanding balances listing.
+        changed_ratio (float, optional): Share of sheet rows with a stale balance.
+        new_ratio (float, optional): Share of leases missing from the steady-state sheet.
+        missing_tenant_ratio (float, optional): Share of leases with no current tenants.
+        leases_per_property (int, optional): Average leases per rental property.
+        seed (int, optional): Random seed; the same arguments give the same portfolio.
+
+    Returns:
+        Portfolio: Generated data set.
+    """
+    rng = random.Random(seed)
+    property_count = max(1, leases // leases_per_property)
+    rentals = {}
+    for property_id in range(1, property_count + 1):
+        city, state = rng.choice(CITIES)
+        rentals[property_id] = {
+            "Id": property_id,
+            "Name": f"{rng.choice(STREETS)} Residences {property_id}",
+            "Address": {
+                "AddressLine1": f"{rng.randint(100, 9999)} {rng.choice(STREETS)} St",
+                "City": city,
+                "State": state,
+                "PostalCode": f"{rng.randint(10000, 99999)}",
+            },
+        }
+
+    balances = []
+    lease_details = {}
+    for lease_id in range(1, leases + 1):
+        property_id = rng.randint(1, property_count)
+        unit_id = property_id * 1000 + rng.randint(1, leases_per_property)
+        total = _balance(rng)
+        balances.append({
+            "LeaseId": lease_id,
+            "PropertyId": property_id,
+            "UnitId": unit_id,
+            "Balance0To30Days": total,
+            "Balance31To60Days": 0,
+            "Balance61To90Days": 0,
+            "BalanceOver90Days": 0,
+            "TotalBalance": total,
+        })
+        tenants = []
+        if rng.random() >= missing_tenant_ratio:
+            tenants.append({
+                "Id": lease_id * 10,
+                "FirstName": rng.choice(FIRST_NAMES),
+                "LastName": rng.choice(LAST_NAMES),
+                "PhoneNumbers": [{"Number": f"({rng.randint(200, 999)}) 555-{rng.randint(0, 9999):04d}", "Type": "Cell"}],
+            })
+        lease_details[lease_id] = {
+            "Id": lease_id,
+            "PropertyId": property_id,
+            "UnitId": unit_id,
+            "LeaseStatus": "Active",
+            "CurrentTenants": tenants,
+        }
+
+    new_count = int(leases * new_ratio)
+    new_lease_ids = set(range(leases - new_count + 1, leases + 1))
+    stale_balances = {}
+    for entry in balances:
+        if entry["LeaseId"] not in new_lease_ids and rng.random() < changed_ratio:
+            stale_balances[entry["LeaseId"]] = round(entry["TotalBalance"] + rng.choice((-1, 1)) * rng.uniform(1, 500), 2)
+    return Portfolio(balances, lease_details, rentals, new_lease_ids, stale_balances)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic Buildium portfolio as JSON files.")
+    parser.add_argument("--leases", type=int, default=1000)
+    parser.add_argument("--changed-ratio", type=float, default=0.05)
+    parser.add_argument("--new-ratio", type=float, default=0.01)
+    parser.add_argument("--missing-tenant-ratio", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="directory for balances.json, leases.json, rentals.json and sheet.json")
+    args = parser.parse_args()
+
+    portfolio = generate_portfolio(
+        args.leases, args.changed_ratio, args.new_ratio, args.missing_tenant_ratio, seed=args.seed
+    )
+    os.makedirs(args.out, exist_ok=True)
+    sheet = portfolio.sheet_rows("steady")
+    outputs = {
+        "balances.json": portfolio.balances,
+        "leases.json": list(portfolio.leases.values()),
+        "rentals.json": list(portfolio.rentals.values()),
+        "sheet.json": [
+            [sheet[row].get(col, "") for col in range(LEASE_ID_COLUMN + 1)]
+            for row in sorted(sheet)
+        ],
+    }
+    for name, payload in outputs.items():
+        with open(os.path.join(args.out, name), "w") as f:
+            json.dump(payload, f)
+    print(f"Wrote {args.leases} leases to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Startup import-time budget for buildium_sync.
+
+Imports the module in a fresh interpreter under ``python -X importtime``
+and fails (exit status 1) when either:
+
+- the cumulative import time of ``buildium_sync`` exceeds the budget, or
+- a module that must stay lazy (the Google client stack, httpx, OpenTelemetry) is
+  imported at startup.
+
+The import is repeated ``--runs`` times and the fastest run is compared
+against the budget to keep noise from failing the check.
+
+Usage:
+    python benchmarks/startup_importtime.py [--budget-ms 500] [--runs 3] [--top 15]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start budget for ``import buildium_sync`` in milliseconds.
+DEFAULT_BUDGET_MS = 500
+
+# Packages that must only be imported on first use.
+LAZY_MODULES = ("googleapiclient", "google.oauth2", "google.auth", "httpx", "opentelemetry")
+
+
+def measure_import():
+    """
+    Import buildium_sync once under ``-X importtime``.
+
+    Returns:
+        list: (module name, self microseconds, cumulative microseconds) per import.
+    """
+    pythonpath = os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONPATH=pythonpath)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import buildium_sync"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing buildium_sync failed:\n{proc.stderr}")
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def import_time_ms(imports):
+    """
+    Args:
+        imports (list): Result of ``measure_import``.
+
+    Returns:
+        float: Cumulative import time of ``buildium_sync`` in milliseconds.
+    """
+    return next(cum for name, _, cum in imports if name == "buildium_sync") / 1000
+
+
+def eager_imports(imports):
+    """
+    Args:
+        imports (list): Result of ``measure_import``.
+
+    Returns:
+        list: Sorted names of LAZY_MODULES (and their submodules) imported at startup.
+    """
+    return sorted({
+        name for name, _, _ in imports
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [measure_import() for _ in range(max(1, args.runs))]
+    totals = [import_time_ms(run) for run in runs]
+    best = runs[totals.index(min(totals))]
+    total_ms = min(totals)
+
+    print(f"Slowest imports (cumulative, best of {len(runs)} runs):")
+    for name, _, cumulative_us in sorted(best, key=lambda item: item[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import buildium_sync took {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    eager = eager_imports(best)
+    if eager:
+        failures.append("modules that must load lazily were imported at startup: " + ", ".join(eager))
+
+    print(f"\nimport buildium_sync: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Within startup budget")
+
+
+if __name__ == "__main__":
+    main()
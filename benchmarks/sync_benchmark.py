@@ -0,0 +1,220 @@
+"""
+Offline sync benchmark against local fakes of Buildium and Google Sheets.
+
+For each portfolio size and scenario a data set is generated by
+``portfolio.generate_portfolio``, served by
+``fake_services.FakeServices`` and synced once by a fresh interpreter
+running ``buildium_sync.run_configured_sync(full=True)`` with
+BUILDIUM_BASE_URL and SHEETS_API_ENDPOINT pointed at the fakes. Each run
+reports wall time, Buildium/Sheets call counts (as seen by the server),
+429s, peak RSS of the sync process and, with ``--tracemalloc``, the peak
+traced Python allocation. ``steady`` starts from a sheet kept up to date
+by earlier syncs (some stale balances, a few new leases); ``cold`` starts
+from an empty sheet, so every lease is enriched and appended. The
+resulting sheet is checked against the Buildium balances; any mismatch
+makes the script exit with status 1.
+
+Other tuning variables (BUILDIUM_PAGE_CONCURRENCY, SYNC_FLUSH_ROWS, ...)
+are passed through from the environment.
+
+Usage:
+    python benchmarks/sync_benchmark.py [--leases 1000 10000 100000]
+        [--scenario steady cold] [--changed-ratio 0.05] [--new-ratio 0.01]
+        [--missing-tenant-ratio 0.02] [--latency 0.05] [--throttle-rate 0.01]
+        [--engine threads|async] [--rate-limit 1000] [--tracemalloc] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from fake_services import FakeBuildium, FakeServices, FakeSheet
+from portfolio import BALANCE_COLUMN, LEASE_ID_COLUMN, SCENARIOS, generate_portfolio
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def count_mismatches(buildium, sheet):
+    """
+    Count leases whose sheet balance differs from Buildium after a sync.
+
+    Args:
+        buildium (FakeBuildium): Source data set.
+        sheet (FakeSheet): Synced sheet.
+
+    Returns:
+        int: Leases missing from the sheet or with a different balance.
+    """
+    on_sheet = {
+        row.get(LEASE_ID_COLUMN): row.get(BALANCE_COLUMN)
+        for row in sheet.rows.values()
+        if row.get(LEASE_ID_COLUMN)
+    }
+    return sum(
+        1 for entry in buildium.balances
+        if on_sheet.get(str(entry["LeaseId"])) != entry["TotalBalance"]
+    )
+
+
+def run_child(result_path, use_tracemalloc):
+    """
+    Run one sync in this process and write its measurements to ``result_path``.
+
+    Args:
+        result_path (str): JSON file to write.
+        use_tracemalloc (bool): Whether to trace Python allocations.
+    """
+    import resource
+    import tracemalloc
+
+    import buildium_sync
+
+    if use_tracemalloc:
+        tracemalloc.start()
+    start = time.perf_counter()
+    report = buildium_sync.run_configured_sync(full=True)
+    wall_seconds = time.perf_counter() - start
+    result = {
+        "wall_seconds": round(wall_seconds, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "report": report,
+    }
+    if use_tracemalloc:
+        result["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+    with open(result_path, "w") as f:
+        json.dump(result, f)
+
+
+def run_scenario(buildium, sheet, args, workdir):
+    """
+    Serve a data set from the fakes and sync it in a child interpreter.
+
+    Args:
+        buildium (FakeBuildium): Buildium data set.
+        sheet (FakeSheet): Sheet state before the sync; updated in place.
+        args (argparse.Namespace): Command-line options.
+        workdir (str): Scratch directory for state and result files.
+
+    Returns:
+        dict: Measurements, server-side call counts and sync report.
+    """
+    result_path = os.path.join(workdir, "result.json")
+    services = FakeServices(
+        buildium, sheet,
+        latency=args.latency,
+        sheets_latency=args.sheets_latency,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    with services:
+        env = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])),
+            BUILDIUM_BASE_URL=services.buildium_url,
+            SHEETS_API_ENDPOINT=services.sheets_url,
+            SHEET_ID="benchmark",
+            SHEET_NAME="Sheet1",
+            SYNC_ENGINE=args.engine,
+            SYNC_INCREMENTAL="0",
+            SYNC_STATE_PATH=os.path.join(workdir, "state.sqlite3"),
+            SYNC_LOCK_BACKEND="none",
+            BUILDIUM_RATE_LIMIT=str(args.rate_limit),
+            BUILDIUM_RATE_BURST=str(args.rate_limit),
+        )
+        env.pop("PROPERTY_CACHE_FILE", None)
+        env.setdefault("RETRY_BASE_DELAY", "0.05")
+        env.setdefault("RETRY_MAX_DELAY", "1")
+        command = [sys.executable, os.path.abspath(__file__), "--child", result_path]
+        if args.tracemalloc:
+            command.append("--tracemalloc")
+        proc = subprocess.run(command, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"sync failed:\n{proc.stderr}")
+        calls = dict(services.calls)
+
+    with open(result_path) as f:
+        result = json.load(f)
+    result["buildium_calls"] = sum(n for key, n in calls.items() if key.startswith("buildium ") and key != "buildium 429")
+    result["sheets_calls"] = sum(n for key, n in calls.items() if key.startswith("sheets "))
+    result["throttled"] = calls.get("buildium 429", 0)
+    result["calls"] = calls
+    result["mismatches"] = count_mismatches(buildium, sheet)
+    return result
+
+
+def print_table(results):
+    """
+    Print one line per run.
+
+    Args:
+        results (list): Results from ``run_scenario`` with ``scenario`` and ``leases`` keys.
+    """
+    header = f"{'scenario':<9}{'leases':>8} {'wall s':>8} {'buildium':>9} {'sheets':>7} {'429s':>5} {'rss MB':>7} {'traced MB':>10} {'mismatch':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        traced = r.get("peak_traced_mb", "-")
+        print(f"{r['scenario']:<9}{r['leases']:>8} {r['wall_seconds']:>8.2f} {r['buildium_calls']:>9} {r['sheets_calls']:>7} "
+              f"{r['throttled']:>5} {r['peak_rss_mb']:>7} {traced:>10} {r['mismatches']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leases", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="portfolio sizes to benchmark")
+    parser.add_argument("--scenario", choices=SCENARIOS, nargs="+", default=list(SCENARIOS),
+                        help="sheet state before the sync")
+    parser.add_argument("--changed-ratio", type=float, default=0.05, help="share of sheet rows with a stale balance")
+    parser.add_argument("--new-ratio", type=float, default=0.01, help="share of leases not on the steady-state sheet")
+    parser.add_argument("--missing-tenant-ratio", type=float, default=0.02, help="share of leases without tenants")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each Buildium response")
+    parser.add_argument("--sheets-latency", type=float, default=0.0, help="seconds added to each Sheets response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of Buildium requests answered with 429")
+    parser.add_argument("--engine", choices=("threads", "async"), default="threads", help="SYNC_ENGINE to run")
+    parser.add_argument("--rate-limit", type=float, default=1000.0,
+                        help="BUILDIUM_RATE_LIMIT and BUILDIUM_RATE_BURST for the sync")
+    parser.add_argument("--seed", type=int, default=0, help="seed for data generation and 429 injection")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report peak traced Python memory (slower)")
+    parser.add_argument("--json", metavar="PATH", help="write full results, including sync reports, to PATH")
+    parser.add_argument("--child", metavar="RESULT_PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.tracemalloc)
+        return 0
+
+    results = []
+    for leases in args.leases:
+        portfolio = generate_portfolio(
+            leases,
+            changed_ratio=args.changed_ratio,
+            new_ratio=args.new_ratio,
+            missing_tenant_ratio=args.missing_tenant_ratio,
+            seed=args.seed,
+        )
+        buildium = FakeBuildium(portfolio.balances, portfolio.leases, portfolio.rentals)
+        for scenario in args.scenario:
+            sheet = FakeSheet(portfolio.sheet_rows(scenario))
+            with tempfile.TemporaryDirectory() as workdir:
+                result = run_scenario(buildium, sheet, args, workdir)
+            result["scenario"] = scenario
+            result["leases"] = leases
+            results.append(result)
+            print(f"synced {leases} leases ({scenario}) in {result['wall_seconds']:.2f}s", file=sys.stderr)
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(r["mismatches"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
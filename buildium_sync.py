@@ -1,9 +1,24 @@
 
+import asyncio
+import contextvars
+import fcntl
+import functools
+import hashlib
+import json
 import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
 import requests
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from flask import Flask, Response, request
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
 import sys
 
 def get_env_var(name, default=None):
@@ -19,18 +34,144 @@ def get_env_var(name, default=None):
     """
     return os.environ.get(name, default)
 
+def get_positive_float(name, default):
+    """
+    Read a numeric environment variable that must be greater than zero.
+
+    Args:
+        name (str): Environment variable name.
+        default (str): Default value to use if not found.
+
+    Returns:
+        float: The parsed value.
+
+    Raises:
+        ValueError: If the value is not a number greater than zero.
+    """
+    value = float(get_env_var(name, default))
+    if value <= 0:
+        raise ValueError(f"{name} must be greater than 0, got {value:g}")
+    return value
+
+def get_choice(name, default, choices):
+    """
+    Read an environment variable that must be one of a fixed set of values.
+
+    Args:
+        name (str): Environment variable name.
+        default (str): Default value to use if not found.
+        choices (tuple): Accepted values.
+
+    Returns:
+        str: The value.
+
+    Raises:
+        ValueError: If the value is not one of ``choices``.
+    """
+    value = get_env_var(name, default)
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {', '.join(choices)}, got {value!r}")
+    return value
+
 # Environment Variables
 SHEET_ID = get_env_var("SHEET_ID", "dummy_sheet_id")
 SHEET_NAME = get_env_var("SHEET_NAME", "Sheet1")
 BUILD_IUM_CLIENT_ID = get_env_var("BUILD_IUM_CLIENT_ID", "dummy")
 BUILD_IUM_CLIENT_SECRET = get_env_var("BUILD_IUM_CLIENT_SECRET", "dummy")
+BUILDIUM_RATE_LIMIT = get_positive_float("BUILDIUM_RATE_LIMIT", "10")
+BUILDIUM_RATE_BURST = get_positive_float("BUILDIUM_RATE_BURST", "10")
+BUILDIUM_PAGE_CONCURRENCY = max(1, int(get_env_var("BUILDIUM_PAGE_CONCURRENCY", "4")))
+BUILDIUM_ENRICH_WORKERS = max(1, int(get_env_var("BUILDIUM_ENRICH_WORKERS", "4")))
+BUILDIUM_BASE_URL = get_env_var("BUILDIUM_BASE_URL", "https://api.buildium.com/v1")
+BUILDIUM_TIMEOUT = float(get_env_var("BUILDIUM_TIMEOUT", "30"))
+BUILDIUM_MAX_RETRIES = int(get_env_var("BUILDIUM_MAX_RETRIES", "5"))
+BUILDIUM_RETRY_STATUSES = (429, 500, 502, 503, 504)
+BUILDIUM_LEASE_STATUSES = ("Active",)
+PROPERTY_CACHE_SIZE = int(get_env_var("PROPERTY_CACHE_SIZE", "5000"))
+PROPERTY_CACHE_TTL = float(get_env_var("PROPERTY_CACHE_TTL", "86400"))
+PROPERTY_CACHE_FILE = get_env_var("PROPERTY_CACHE_FILE")
+BUILDIUM_BULK_CHUNK = max(1, int(get_env_var("BUILDIUM_BULK_CHUNK", "100")))
+LEASE_BULK_THRESHOLD = int(get_env_var("LEASE_BULK_THRESHOLD", "20"))
+SYNC_INCREMENTAL = get_env_var("SYNC_INCREMENTAL", "0") == "1"
+SYNC_STATE_PATH = get_env_var("SYNC_STATE_PATH", "/tmp/buildium_sync_state.sqlite3")
+SYNC_FULL_INTERVAL = float(get_env_var("SYNC_FULL_INTERVAL", "3600"))
+SYNC_FLUSH_ROWS = max(1, int(get_env_var("SYNC_FLUSH_ROWS", "2000")))
+SYNC_JOB_HISTORY = max(1, int(get_env_var("SYNC_JOB_HISTORY", "50")))
+SYNC_LOCK_BACKEND = get_env_var("SYNC_LOCK_BACKEND", "none")
+SYNC_LOCK_PATH = get_env_var("SYNC_LOCK_PATH", "/tmp/buildium_sync.lock")
+SYNC_ENGINE = get_choice("SYNC_ENGINE", "threads", ("threads", "async"))
+SYNC_TRACING = get_env_var("SYNC_TRACING", "none")
+SHEET_REWRITE_RATIO = float(get_env_var("SHEET_REWRITE_RATIO", "0.5"))
+SHEETS_MAX_PAYLOAD_BYTES = int(get_env_var("SHEETS_MAX_PAYLOAD_BYTES", "1000000"))
+SHEETS_WRITES_PER_MINUTE = get_positive_float("SHEETS_WRITES_PER_MINUTE", "60")
+SHEETS_WRITE_BURST = get_positive_float("SHEETS_WRITE_BURST", "10")
+SHEETS_MAX_RETRIES = int(get_env_var("SHEETS_MAX_RETRIES", "5"))
+SHEETS_RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_BASE_DELAY = float(get_env_var("RETRY_BASE_DELAY", "1"))
+RETRY_MAX_DELAY = float(get_env_var("RETRY_MAX_DELAY", "60"))
 
-# Setup credentials and API client
+# Credentials and API client are created lazily on first use
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-creds = service_account.Credentials.from_service_account_file(
-    "/secrets/creds.json", scopes=SCOPES
-)
-sheets = build("sheets", "v4", credentials=creds).spreadsheets()
+GOOGLE_CREDS_PATH = get_env_var("GOOGLE_CREDS_PATH", "/secrets/creds.json")
+SHEETS_API_ENDPOINT = get_env_var("SHEETS_API_ENDPOINT")
+_creds = None
+_creds_lock = threading.Lock()
+_sheets_local = threading.local()
+
+def get_credentials():
+    """
+    Load the service account credentials once, on first use.
+
+    Returns:
+        google.oauth2.service_account.Credentials: Shared credentials.
+    """
+    global _creds
+    if _creds is None:
+        with _creds_lock:
+            if _creds is None:
+                from google.oauth2 import service_account
+
+                _creds = service_account.Credentials.from_service_account_file(
+                    GOOGLE_CREDS_PATH, scopes=SCOPES
+                )
+    return _creds
+
+def get_sheets():
+    """
+    Return the Sheets ``spreadsheets()`` resource for the calling thread.
+
+    The client is built on first use from the discovery document bundled
+    with googleapiclient, so neither import nor startup touches the network
+    or the credentials file, and the Google libraries themselves are only
+    imported here. Each thread gets its own client because the
+    underlying httplib2 connection is not thread-safe. When
+    SHEETS_API_ENDPOINT is set (e.g. the benchmark fakes), requests go there
+    with anonymous credentials instead.
+
+    Returns:
+        googleapiclient.discovery.Resource: Spreadsheets resource.
+    """
+    client = getattr(_sheets_local, "client", None)
+    if client is None:
+        from googleapiclient.discovery import build
+
+        if SHEETS_API_ENDPOINT:
+            from google.auth.credentials import AnonymousCredentials
+
+            credentials = AnonymousCredentials()
+            client_options = {"api_endpoint": SHEETS_API_ENDPOINT}
+        else:
+            credentials = get_credentials()
+            client_options = None
+        client = build(
+            "sheets", "v4",
+            credentials=credentials,
+            client_options=client_options,
+            static_discovery=True,
+            cache_discovery=False,
+        ).spreadsheets()
+        _sheets_local.client = client
+    return client
 
 app = Flask(__name__)
 
@@ -39,46 +180,1026 @@ def log_request():
     """Logs each incoming request path."""
     print(f"received request: {request.path}", file=sys.stderr)
 
-def get_lease_id_map():
+class BuildiumError(Exception):
+    """
+    Raised when a Buildium request still fails after retries.
+
+    Attributes:
+        status_code (int): HTTP status of the last attempt.
+        offset (int or None): Page offset that failed, for paginated listings.
+        partial (list): Items fetched from earlier pages before the failure.
+    """
+
+    def __init__(self, response, offset=None):
+        super().__init__(f"Buildium error: {response.status_code} - {response.text}")
+        self.status_code = response.status_code
+        self.offset = offset
+        self.partial = []
+
+class BuildiumClient:
+    """
+    Pooled HTTP client for the Buildium API.
+
+    Owns a ``requests.Session`` with the auth headers set once and an
+    ``HTTPAdapter`` sized for the worker pools, so connections to
+    api.buildium.com are kept alive and reused across calls and threads.
+    GETs are idempotent, so throttled (429), 5xx and connection failures are
+    retried with capped exponential backoff, honoring ``Retry-After``. Every
+    attempt first takes a token from ``limiter`` so concurrent workers stay
+    under Buildium's per-second limit.
+    """
+
+    def __init__(self, client_id, client_secret, base_url=BUILDIUM_BASE_URL, pool_size=10, limiter=None):
+        """
+        Args:
+            client_id (str): Buildium API client ID.
+            client_secret (str): Buildium API client secret.
+            base_url (str, optional): API root, e.g. ``https://api.buildium.com/v1``.
+            pool_size (int, optional): Maximum pooled connections per host.
+            limiter (TokenBucket, optional): Rate limiter shared by all calls.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.limiter = limiter
+        self.session = requests.Session()
+        self.session.headers.update({
+            "x-buildium-client-id": client_id,
+            "x-buildium-client-secret": client_secret,
+            "Accept": "application/json",
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, path, params=None):
+        """
+        Issue a GET request against the Buildium API, retrying transient failures.
+
+        Args:
+            path (str): Path below the API root, e.g. ``/leases/123``.
+            params (dict, optional): Query string parameters.
+
+        Returns:
+            requests.Response: The last response received.
+        """
+        url = f"{self.base_url}{path}"
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            report_count("buildium_calls")
+            try:
+                with observe_api_call("buildium", path):
+                    res = self.session.get(url, params=params, timeout=BUILDIUM_TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= BUILDIUM_MAX_RETRIES:
+                    raise
+                delay = _backoff_delay(attempt)
+                print(f"⚠️ Buildium {path} failed ({e}), retrying in {delay:.1f}s", file=sys.stderr)
+            else:
+                report_count("buildium_bytes", len(res.content))
+                if res.status_code == 429:
+                    count_throttled("buildium")
+                if res.status_code not in BUILDIUM_RETRY_STATUSES or attempt >= BUILDIUM_MAX_RETRIES:
+                    return res
+                delay = _backoff_delay(attempt, res.headers.get("Retry-After"))
+                print(f"⚠️ Buildium {path} returned {res.status_code}, retrying in {delay:.1f}s", file=sys.stderr)
+            count_retry("buildium")
+            time.sleep(delay)
+            attempt += 1
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time-to-live.
+
+    Concurrent lookups of the same missing key are collapsed so the loader
+    runs at most once per key. When ``path`` is set, entries are loaded from
+    and saved to a JSON file so they survive across Cloud Run invocations.
     """
-    Build a mapping of lease IDs to row indices from the Google Sheet.
 
+    def __init__(self, maxsize=5000, ttl=3600, path=None):
+        """
+        Args:
+            maxsize (int, optional): Maximum number of entries kept.
+            ttl (float, optional): Seconds an entry stays valid.
+            path (str, optional): JSON file used to persist entries.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _lookup(self, key):
+        """Return a live cached value or None. Caller must hold the lock."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def _store(self, key, value, expires_at):
+        """Insert a value and evict the oldest entries. Caller must hold the lock."""
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get_or_load(self, key, loader, counted=False):
+        """
+        Return the cached value for ``key``, calling ``loader(key)`` on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            loader (Callable): Function returning the value, or None on failure.
+                None results are not cached.
+            counted (bool, optional): The caller already counted this lookup
+                as a miss with ``get``, so it is not counted again.
+
+        Returns:
+            Any: Cached or freshly loaded value.
+        """
+        count = 0 if counted else 1
+        while True:
+            with self._lock:
+                if not self._loaded:
+                    self._load_locked()
+                value = self._lookup(key)
+                if value is not None:
+                    self.hits += count
+                    return value
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    self.misses += count
+                    break
+            event.wait()
+            with self._lock:
+                value = self._lookup(key)
+                if value is not None:
+                    self.hits += count
+                    return value
+            # The other loader failed; retry as the owner.
+
+        try:
+            value = loader(key)
+            if value is not None:
+                with self._lock:
+                    self._store(key, value, time.time() + self.ttl)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def get(self, key):
+        """
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            Any: Live cached value, or None (counted as a miss).
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load_locked()
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to cache for ``ttl`` seconds.
+        """
+        with self._lock:
+            self._store(key, value, time.time() + self.ttl)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Cumulative hit and miss counts and current size.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def _load_locked(self):
+        """Load persisted entries from ``path``. Caller must hold the lock."""
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable cache file {self.path}: {e}", file=sys.stderr)
+            return
+        now = time.time()
+        for key, expires_at, value in entries:
+            if expires_at > now:
+                self._store(key, value, expires_at)
+
+    def save(self):
+        """Persist live entries to ``path`` (no-op when persistence is off)."""
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            entries = [
+                [key, expires_at, value]
+                for key, (expires_at, value) in self._data.items()
+                if expires_at > now
+            ]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to pace API calls.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Callers reserve tokens up front; when the bucket is empty the
+    reservation drives it negative and the caller sleeps off the debt, so
+    waiters are served in arrival order without busy-looping.
+    """
+
+    def __init__(self, rate, capacity):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum burst size.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+        self.waits = 0
+
+    def _refill_locked(self):
+        """Add tokens for the time elapsed. Caller must hold the lock."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens=1):
+        """
+        Take tokens from the bucket without blocking.
+
+        Args:
+            tokens (float, optional): Tokens to take.
+
+        Returns:
+            float: Seconds the caller must wait before proceeding.
+        """
+        with self._lock:
+            self._refill_locked()
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+            if wait > 0:
+                self.total_wait += wait
+                self.waits += 1
+            return wait
+
+    def acquire(self, tokens=1):
+        """
+        Take tokens from the bucket, sleeping until they are available.
+
+        Args:
+            tokens (float, optional): Tokens to take.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def level(self):
+        """
+        Returns:
+            float: Tokens currently available (negative while callers wait).
+        """
+        with self._lock:
+            self._refill_locked()
+            return self._tokens
+
+    def stats(self):
+        """
+        Returns:
+            dict: Current token level, cumulative seconds callers were told to
+            wait, and how many reservations had to wait.
+        """
+        with self._lock:
+            self._refill_locked()
+            return {"tokens": self._tokens, "wait_seconds": self.total_wait, "waits": self.waits}
+
+class SyncState:
+    """
+    SQLite-backed watermark of what previous syncs wrote to the sheet.
+
+    Stores a short hash of the last-written balance per lease plus the times
+    of the last sync and last full sync, so incremental runs can skip leases
+    whose balance has not changed without consulting the sheet.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): SQLite database file.
+        """
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lease_balances "
+                "(lease_id TEXT PRIMARY KEY, balance_hash TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS watermark "
+                "(key TEXT PRIMARY KEY, value REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        """Open a new connection; connections are not shared across threads."""
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def balance_hash(balance):
+        """
+        Args:
+            balance (float): Lease balance.
+
+        Returns:
+            str: Short, stable hash of the balance.
+        """
+        return hashlib.sha1(repr(float(balance)).encode()).hexdigest()[:16]
+
+    def watermark(self):
+        """
+        Returns:
+            dict: ``last_sync`` and ``last_full_sync`` epoch seconds (0 if never).
+        """
+        with closing(self._connect()) as conn:
+            rows = dict(conn.execute("SELECT key, value FROM watermark").fetchall())
+        return {
+            "last_sync": rows.get("last_sync", 0.0),
+            "last_full_sync": rows.get("last_full_sync", 0.0),
+        }
+
+    def known_hashes(self):
+        """
+        Returns:
+            dict: Lease ID to the hash of its last-written balance.
+        """
+        with closing(self._connect()) as conn:
+            return dict(conn.execute("SELECT lease_id, balance_hash FROM lease_balances").fetchall())
+
+    def changed(self, balances, known=None):
+        """
+        Filter balance entries down to those not already written as-is.
+
+        Args:
+            balances (list): Outstanding balance entries from Buildium.
+            known (dict, optional): Result of ``known_hashes``; read from the
+                database when omitted.
+
+        Returns:
+            list: Entries that are new or whose balance hash differs.
+        """
+        if known is None:
+            known = self.known_hashes()
+        return [
+            entry for entry in balances
+            if known.get(str(entry["LeaseId"])) != self.balance_hash(entry["TotalBalance"])
+        ]
+
+    def record(self, written):
+        """
+        Store the balances now on the sheet.
+
+        Args:
+            written (list): (lease ID, balance) pairs known to match the sheet.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO lease_balances (lease_id, balance_hash) VALUES (?, ?)",
+                [(str(lease_id), self.balance_hash(balance)) for lease_id, balance in written],
+            )
+
+    def mark_synced(self, full):
+        """
+        Advance the watermark after a successful sync.
+
+        Args:
+            full (bool): Whether this run compared every lease.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO watermark (key, value) VALUES ('last_sync', ?)", (now,))
+            if full:
+                conn.execute("INSERT OR REPLACE INTO watermark (key, value) VALUES ('last_full_sync', ?)", (now,))
+
+class LeaseIndex:
+    """
+    Leases listed through ``/leases`` during one sync, keyed by lease Id.
+
+    Remembers which properties have already been listed so no property is
+    listed twice in a run. Each lease appears once in the balance listing,
+    so leases are dropped from the index as soon as they are used.
+    """
+
+    def __init__(self):
+        self.properties = set()
+        self.leases = {}
+        self._lock = threading.Lock()
+
+    def claim(self, property_ids):
+        """
+        Mark properties as listed.
+
+        Args:
+            property_ids (Iterable[int]): Properties the caller wants listed.
+
+        Returns:
+            list: The IDs not listed before, which the caller must now list.
+        """
+        with self._lock:
+            new = [property_id for property_id in property_ids if property_id not in self.properties]
+            self.properties.update(new)
+        return new
+
+    def add(self, leases):
+        """
+        Args:
+            leases (Iterable[dict]): Leases returned by the listing.
+        """
+        with self._lock:
+            for lease in leases:
+                if lease.get("Id") is not None:
+                    self.leases[lease["Id"]] = lease
+
+    def pop(self, lease_id):
+        """
+        Args:
+            lease_id (int): Lease ID.
+
+        Returns:
+            dict or None: The indexed lease, removed from the index.
+        """
+        with self._lock:
+            return self.leases.pop(lease_id, None)
+
+class SyncReport:
+    """
+    Phase timings and API counters collected during one sync.
+
+    Phase durations are cumulative seconds measured with a monotonic clock.
+    Phases that run concurrently (e.g. the sheet snapshot and balance
+    paging) each count their own time, so their sum can exceed the
+    wall-clock duration.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.phases = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, phase, seconds):
+        """
+        Args:
+            phase (str): Phase name.
+            seconds (float): Duration to add.
+        """
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def incr(self, counter, amount=1):
+        """
+        Args:
+            counter (str): Counter name.
+            amount (int, optional): Value to add.
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Wall-clock duration, phase timings and counters.
+        """
+        with self._lock:
+            return {
+                "duration_seconds": round(time.monotonic() - self.started, 3),
+                "phases": {phase: round(seconds, 3) for phase, seconds in self.phases.items()},
+                "counters": dict(self.counters),
+            }
+
+# Report of the sync currently running; syncs are single-flight (see submit_sync_job).
+_active_report = None
+
+def _start_report():
+    """
     Returns:
-        dict: Lease ID to row index mapping.
+        SyncReport: A fresh report that phases and counters now feed into.
+    """
+    global _active_report
+    _active_report = SyncReport()
+    return _active_report
+
+@contextmanager
+def report_phase(phase):
+    """
+    Time the enclosed block as ``phase`` of the running sync's report.
+
+    Args:
+        phase (str or None): Phase name; None records nothing.
+    """
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        report = _active_report
+        if report is not None and phase is not None:
+            report.add_time(phase, time.monotonic() - start)
+
+def timed_phase(phase):
+    """
+    Decorator timing every call of the wrapped function as ``phase``.
+
+    Args:
+        phase (str): Phase name.
     """
-    result = sheets.values().get(
-        spreadsheetId=SHEET_ID,
-        range=f"{SHEET_NAME}!AA2:AA"
-    ).execute()
-    values = result.get("values", [])
-    return {row[0]: idx + 2 for idx, row in enumerate(values) if row}
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with report_phase(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
 
-def get_outstanding_balances():
+def report_count(counter, amount=1):
     """
-    Fetch outstanding lease balances from Buildium API.
+    Add to a counter of the running sync's report, if any.
+
+    Args:
+        counter (str): Counter name.
+        amount (int, optional): Value to add.
+    """
+    report = _active_report
+    if report is not None:
+        report.incr(counter, amount)
+
+buildium_limiter = TokenBucket(BUILDIUM_RATE_LIMIT, BUILDIUM_RATE_BURST)
+buildium = BuildiumClient(
+    BUILD_IUM_CLIENT_ID,
+    BUILD_IUM_CLIENT_SECRET,
+    # Balance pages and enrichment requests are in flight at the same time.
+    pool_size=BUILDIUM_PAGE_CONCURRENCY + BUILDIUM_ENRICH_WORKERS,
+    limiter=buildium_limiter,
+)
+property_cache = TTLCache(
+    maxsize=PROPERTY_CACHE_SIZE,
+    ttl=PROPERTY_CACHE_TTL,
+    path=PROPERTY_CACHE_FILE,
+)
+sync_state = SyncState(SYNC_STATE_PATH) if SYNC_INCREMENTAL else None
+sheets_write_bucket = TokenBucket(SHEETS_WRITES_PER_MINUTE / 60.0, SHEETS_WRITE_BURST)
+
+# Prometheus metrics, served on /metrics
+API_LATENCY = Histogram(
+    "buildium_sync_api_request_seconds",
+    "Latency of Buildium and Sheets API calls, per attempt.",
+    ["service", "endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+API_RETRIES = Counter("buildium_sync_api_retries_total", "API calls retried.", ["service"])
+API_THROTTLED = Counter("buildium_sync_api_throttled_total", "API calls answered with 429.", ["service"])
+ROWS_UPDATED = Counter("buildium_sync_rows_updated_total", "Sheet rows whose balance was updated.")
+ROWS_APPENDED = Counter("buildium_sync_rows_appended_total", "New lease rows appended to the sheet.")
+PROPERTY_CACHE_LOOKUPS = Counter(
+    "buildium_sync_property_cache_lookups_total", "Property cache lookups.", ["result"]
+)
+LAST_SUCCESS_DURATION = Gauge(
+    "buildium_sync_last_success_duration_seconds", "Wall-clock duration of the last successful sync."
+)
+LAST_SUCCESS_TIMESTAMP = Gauge(
+    "buildium_sync_last_success_timestamp_seconds", "Unix time the last successful sync finished."
+)
+Gauge(
+    "buildium_sync_rate_limiter_tokens", "Tokens currently available in the Buildium rate limiter."
+).set_function(buildium_limiter.level)
+Gauge(
+    "buildium_sync_rate_limiter_wait_seconds", "Cumulative seconds callers waited on the Buildium rate limiter."
+).set_function(lambda: buildium_limiter.stats()["wait_seconds"])
+
+@contextmanager
+def observe_api_call(service, endpoint):
+    """
+    Record the latency of the enclosed API call in ``API_LATENCY``.
+
+    Numeric path segments are collapsed to ``{id}`` so each Buildium
+    endpoint is a single label value.
+
+    Args:
+        service (str): ``buildium`` or ``sheets``.
+        endpoint (str): Request path or Sheets method id.
+    """
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        API_LATENCY.labels(service, re.sub(r"/\d+", "/{id}", endpoint)).observe(time.monotonic() - start)
+
+def count_retry(service):
+    """
+    Count a retried API call in the sync report and in ``API_RETRIES``.
+
+    Args:
+        service (str): ``buildium`` or ``sheets``.
+    """
+    report_count(f"{service}_retries")
+    API_RETRIES.labels(service).inc()
+
+def count_throttled(service):
+    """
+    Count a 429 response in the sync report and in ``API_THROTTLED``.
+
+    Args:
+        service (str): ``buildium`` or ``sheets``.
+    """
+    report_count(f"{service}_429s")
+    API_THROTTLED.labels(service).inc()
+
+# Optional OpenTelemetry tracing, enabled with SYNC_TRACING
+_tracer = None
+_tracer_lock = threading.Lock()
+span_exporter = None
+
+def configure_tracing(exporter="console"):
+    """
+    Route this module's spans to ``exporter`` without touching the global provider.
+
+    Args:
+        exporter (str or SpanExporter, optional): ``console``, ``memory``
+            (an ``InMemorySpanExporter`` for offline inspection), ``global``
+            to use whatever provider is registered globally (e.g. OTLP set
+            up by ``opentelemetry-instrument``), or an exporter instance.
+            ``none`` or any other string disables tracing.
+
+    Returns:
+        SpanExporter or None: The exporter spans are sent to, or None when
+        tracing is disabled, OpenTelemetry is not installed or ``exporter``
+        is ``global``.
+    """
+    global _tracer, span_exporter
+    span_exporter = None
+    if isinstance(exporter, str) and exporter not in ("console", "memory", "global"):
+        if exporter != "none":
+            print(f"⚠️ Unknown SYNC_TRACING value {exporter!r}; tracing disabled", file=sys.stderr)
+        _tracer = False
+        return None
+    try:
+        from opentelemetry import trace
+        if exporter != "global":
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    except ImportError:
+        print("⚠️ SYNC_TRACING is set but opentelemetry-sdk is not installed; tracing disabled", file=sys.stderr)
+        _tracer = False
+        return None
+    if exporter == "global":
+        _tracer = trace.get_tracer(__name__)
+        return None
+
+    if exporter == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        exporter = ConsoleSpanExporter()
+    elif exporter == "memory":
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    _tracer = provider.get_tracer(__name__)
+    span_exporter = exporter
+    return exporter
+
+def get_tracer():
+    """
+    Return the tracer configured from SYNC_TRACING on first use.
+
+    Returns:
+        opentelemetry.trace.Tracer or None: None when tracing is disabled
+        or OpenTelemetry is not installed.
+    """
+    if _tracer is None:
+        if SYNC_TRACING == "none":
+            return None
+        with _tracer_lock:
+            if _tracer is None:
+                configure_tracing(SYNC_TRACING)
+    return _tracer or None
+
+@contextmanager
+def trace_span(name, **attributes):
+    """
+    Run the enclosed block inside a child span of the current trace context.
+
+    A no-op when tracing is disabled. Attributes that are None are dropped.
+
+    Args:
+        name (str): Span name.
+        **attributes: Span attributes such as ``offset`` or ``lease_id``.
+
+    Yields:
+        opentelemetry.trace.Span or None: The active span.
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        yield None
+        return
+    attributes = {key: value for key, value in attributes.items() if value is not None}
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+def in_current_context(func):
+    """
+    Bind ``func`` to the caller's context so spans it opens on pool threads
+    are parented to the caller's span.
+
+    Args:
+        func (callable): Function to submit to an executor.
+
+    Returns:
+        callable: Wrapper that runs ``func`` in a copy of the captured context.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+    return wrapper
+
+def _backoff_delay(attempt, retry_after=None):
+    """
+    Compute how long to wait before retry number ``attempt``.
+
+    Args:
+        attempt (int): Zero-based retry attempt.
+        retry_after (str, optional): Retry-After header value in seconds.
 
     Returns:
-        list: All outstanding balances.
+        float: Seconds to sleep; the server hint wins when present, otherwise
+        exponential backoff with full jitter. Both are capped at RETRY_MAX_DELAY.
     """
-    all_balances = []
-    limit = 1000
-    offset = 0
+    if retry_after:
+        try:
+            return min(RETRY_MAX_DELAY, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
 
+def execute_sheets_request(req, write=False, retry_statuses=SHEETS_RETRY_STATUSES):
+    """
+    Execute a Sheets API request with quota pacing and retries.
+
+    Writes first take a token from ``sheets_write_bucket`` so bursts stay
+    under the per-minute quota. Responses with a status in
+    ``retry_statuses`` are retried up to SHEETS_MAX_RETRIES times with
+    exponential backoff plus jitter.
+
+    Args:
+        req (googleapiclient.http.HttpRequest): Prepared request.
+        write (bool, optional): Whether the request counts against the write quota.
+        retry_statuses (tuple, optional): HTTP statuses that are safe to retry.
+
+    Returns:
+        dict: Parsed response body.
+    """
+    from googleapiclient.errors import HttpError
+
+    attempt = 0
     while True:
-        url = f"https://api.buildium.com/v1/leases/outstandingbalances?limit={limit}&offset={offset}"
-        res = requests.get(url, headers={
-            "x-buildium-client-id": BUILD_IUM_CLIENT_ID,
-            "x-buildium-client-secret": BUILD_IUM_CLIENT_SECRET,
-            "Accept": "application/json",
-        })
-        if not res.ok:
-            raise Exception(f"Buildium error: {res.status_code} - {res.text}")
-        data = res.json()
-        all_balances.extend(data)
-        if len(data) < limit:
-            break
+        if write:
+            sheets_write_bucket.acquire()
+        payload_bytes = len(getattr(req, "body", None) or "")
+        method = getattr(req, "methodId", "unknown")
+        report_count("sheets_calls")
+        report_count("sheets_bytes_sent", payload_bytes)
+        try:
+            with trace_span(f"sheets {method}", method=method, payload_bytes=payload_bytes, attempt=attempt), \
+                    observe_api_call("sheets", method):
+                result = req.execute()
+        except HttpError as e:
+            if e.resp.status == 429:
+                count_throttled("sheets")
+            if e.resp.status not in retry_statuses or attempt >= SHEETS_MAX_RETRIES:
+                raise
+            delay = _backoff_delay(attempt, e.resp.get("retry-after"))
+            print(f"⚠️ Sheets returned {e.resp.status}, retrying in {delay:.1f}s", file=sys.stderr)
+            count_retry("sheets")
+            time.sleep(delay)
+            attempt += 1
+        else:
+            report_count("sheets_bytes_received", len(json.dumps(result)))
+            return result
+
+def _split_by_size(items, max_bytes):
+    """
+    Split ``items`` into consecutive chunks whose JSON size stays under ``max_bytes``.
+
+    Args:
+        items (list): JSON-serializable items.
+        max_bytes (int): Approximate payload budget per chunk.
+
+    Returns:
+        list: Non-empty chunks; an item larger than the budget gets its own chunk.
+    """
+    chunks = []
+    chunk = []
+    size = 0
+    for item in items:
+        item_size = len(json.dumps(item)) + 1
+        if chunk and size + item_size > max_bytes:
+            chunks.append(chunk)
+            chunk = []
+            size = 0
+        chunk.append(item)
+        size += item_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def _parse_balance(row):
+    """
+    Convert a column E cell from a sheet snapshot into a float.
+
+    Args:
+        row (list): Row values as returned by the Sheets API.
+
+    Returns:
+        float or None: Cell value, or None when the cell is empty or not a
+        number (a note or an error value), so the row is treated as unknown.
+    """
+    if not row or row[0] in ("", None):
+        return None
+    try:
+        return float(row[0])
+    except (TypeError, ValueError):
+        return None
+
+@timed_phase("sheet_snapshot")
+def get_sheet_snapshot():
+    """
+    Read lease IDs (column AA) and balances (column E) in a single batchGet.
+
+    Returns:
+        tuple: (lease ID to row index mapping, row index to current balance
+        mapping). Empty balance cells map to None.
+    """
+    with trace_span("get_sheet_snapshot"):
+        result = execute_sheets_request(get_sheets().values().batchGet(
+            spreadsheetId=SHEET_ID,
+            ranges=[f"{SHEET_NAME}!E2:E", f"{SHEET_NAME}!AA2:AA"],
+            valueRenderOption="UNFORMATTED_VALUE"
+        ))
+    value_ranges = result.get("valueRanges", [])
+    balance_values = value_ranges[0].get("values", []) if value_ranges else []
+    lease_values = value_ranges[1].get("values", []) if len(value_ranges) > 1 else []
+
+    lease_map = {}
+    balance_map = {}
+    for idx, row in enumerate(lease_values):
+        if not row:
+            continue
+        row_index = idx + 2
+        lease_map[str(row[0])] = row_index
+        balance_map[row_index] = _parse_balance(
+            balance_values[idx] if idx < len(balance_values) else []
+        )
+    return lease_map, balance_map
+
+def _fetch_page(path, params, offset, limit):
+    """
+    Fetch a single page from a paginated Buildium listing.
+
+    Args:
+        path (str): Listing path below the API root.
+        params (dict): Extra query parameters (filters).
+        offset (int): Page offset.
+        limit (int): Page size.
+
+    Returns:
+        list: Items on the page.
+    """
+    with trace_span("buildium page", path=path, offset=offset, limit=limit):
+        res = buildium.get(path, params={**params, "limit": limit, "offset": offset})
+    if not res.ok:
+        raise BuildiumError(res, offset=offset)
+    return res.json()
+
+def iter_pages(path, params=None, limit=1000, offset=0, phase=None, concurrency=BUILDIUM_PAGE_CONCURRENCY):
+    """
+    Yield pages of a paginated Buildium listing in offset order as they arrive.
+
+    The first page is fetched on its own; if it is full, subsequent offset
+    windows are fetched concurrently (up to ``concurrency`` at a time). Once every page of a window has come back full, the next window
+    is requested while the caller is still consuming the current one.
+    Iteration stops at the first short page. Each page is retried on its own
+    by ``BuildiumClient.get``, so a transient failure never restarts the
+    listing.
+
+    Args:
+        path (str): Listing path below the API root.
+        params (dict, optional): Extra query parameters (filters).
+        limit (int, optional): Page size.
+        offset (int, optional): Offset to start from.
+        phase (str, optional): Sync report phase that time spent waiting
+            for pages is recorded under; not recorded when omitted.
+        concurrency (int, optional): Pages requested at once.
+
+    Yields:
+        list: Items on each page.
+    """
+    params = params or {}
+    with report_phase(phase):
+        page = _fetch_page(path, params, offset, limit)
+    yield page
+    if len(page) < limit:
+        return
+
+    window_span = concurrency * limit
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        def submit_window(start):
+            return [
+                executor.submit(in_current_context(_fetch_page), path, params, start + i * limit, limit)
+                for i in range(concurrency)
+            ]
+
+        def window_full(window):
+            return all(
+                f.done() and f.exception() is None and len(f.result()) == limit
+                for f in window
+            )
+
         offset += limit
-    return all_balances
+        window = submit_window(offset)
+        while True:
+            next_window = None
+            for future in window:
+                with report_phase(phase):
+                    page = future.result()
+                if next_window is None and window_full(window):
+                    next_window = submit_window(offset + window_span)
+                yield page
+                if len(page) < limit:
+                    for pending in next_window or []:
+                        pending.cancel()
+                    return
+            offset += window_span
+            window = next_window
+
+def fetch_all_pages(path, params=None, limit=1000, offset=0, concurrency=BUILDIUM_PAGE_CONCURRENCY):
+    """
+    Fetch every item from a paginated Buildium listing.
+
+    Collects the pages produced by ``iter_pages``. If a page still fails
+    after retries, the ``BuildiumError`` carries the failed offset and the
+    items fetched before it; pass that offset back in to resume.
+
+    Args:
+        path (str): Listing path below the API root.
+        params (dict, optional): Extra query parameters (filters).
+        limit (int, optional): Page size.
+        offset (int, optional): Offset to start from.
+        concurrency (int, optional): Pages requested at once.
+
+    Returns:
+        list: All items, in offset order.
+    """
+    all_items = []
+    try:
+        for page in iter_pages(path, params, limit, offset, concurrency=concurrency):
+            all_items.extend(page)
+    except BuildiumError as e:
+        e.partial = all_items
+        raise
+    return all_items
 
 def get_lease_details(lease_id):
     """
@@ -90,16 +1211,13 @@ def get_lease_details(lease_id):
     Returns:
         dict or None: Lease details or None if failed.
     """
-    res = requests.get(f"https://api.buildium.com/v1/leases/{lease_id}", headers={
-        "x-buildium-client-id": BUILD_IUM_CLIENT_ID,
-        "x-buildium-client-secret": BUILD_IUM_CLIENT_SECRET,
-        "Accept": "application/json",
-    })
+    with trace_span("buildium get_lease_details", lease_id=lease_id):
+        res = buildium.get(f"/leases/{lease_id}")
     return res.json() if res.ok else None
 
-def get_property_details(property_id):
+def _fetch_property_details(property_id):
     """
-    Get property address details.
+    Fetch property details from Buildium API, bypassing the cache.
 
     Args:
         property_id (int): Property ID.
@@ -107,132 +1225,1058 @@ def get_property_details(property_id):
     Returns:
         dict or None: Property details or None if failed.
     """
-    res = requests.get(f"https://api.buildium.com/v1/rentals/{property_id}", headers={
-        "x-buildium-client-id": BUILD_IUM_CLIENT_ID,
-        "x-buildium-client-secret": BUILD_IUM_CLIENT_SECRET,
-        "Accept": "application/json",
-    })
+    with trace_span("buildium get_property_details", property_id=property_id):
+        res = buildium.get(f"/rentals/{property_id}")
     return res.json() if res.ok else None
 
-def write_to_sheet(updates):
+def get_property_details(property_id, counted=False):
+    """
+    Get property address details, served from ``property_cache`` when possible.
+
+    Args:
+        property_id (int): Property ID.
+        counted (bool, optional): The lookup was already counted as a cache miss.
+
+    Returns:
+        dict or None: Property details or None if failed.
+    """
+    return property_cache.get_or_load(property_id, _fetch_property_details, counted=counted)
+
+def _fetch_filtered_listing(path, filter_name, ids, params=None):
+    """
+    Page through a Buildium listing filtered by ``ids``, in chunks.
+
+    IDs are sent BUILDIUM_BULK_CHUNK at a time as repeated ``filter_name``
+    query parameters; chunks are fetched on the enrichment worker pool, each
+    paging sequentially so at most BUILDIUM_ENRICH_WORKERS requests are in
+    flight on top of the balances listing. A
+    chunk that fails is logged and skipped so callers can fall back to
+    single-item GETs.
+
+    Args:
+        path (str): Listing path below the API root.
+        filter_name (str): Query parameter carrying the IDs.
+        ids (list): IDs to filter by.
+        params (dict, optional): Extra query parameters sent with every chunk.
+
+    Returns:
+        list: Items returned across all chunks.
+    """
+    chunks = [ids[i:i + BUILDIUM_BULK_CHUNK] for i in range(0, len(ids), BUILDIUM_BULK_CHUNK)]
+
+    def fetch_chunk(chunk):
+        try:
+            return fetch_all_pages(path, {**(params or {}), filter_name: chunk}, concurrency=1)
+        except Exception as e:
+            print(f"⚠️ Bulk {path} lookup failed, falling back to single GETs: {e}", file=sys.stderr)
+            return []
+
+    items = []
+    with ThreadPoolExecutor(max_workers=BUILDIUM_ENRICH_WORKERS) as executor:
+        for chunk_items in executor.map(in_current_context(fetch_chunk), chunks):
+            items.extend(chunk_items)
+    return items
+
+@timed_phase("lease_enrichment")
+def get_leases_bulk(entries, index=None):
+    """
+    Resolve lease details for many balance entries at once.
+
+    Leases already in ``index`` are used first. When at least
+    LEASE_BULK_THRESHOLD of the rest are needed, ``/leases`` is listed for
+    the PropertyIds carried on those entries that ``index`` has not listed
+    yet, restricted to BUILDIUM_LEASE_STATUSES, and the results are added
+    to ``index``. Leases not found that way (or all of them, below the
+    threshold) are fetched with single-lease GETs.
+
+    Args:
+        entries (list): Outstanding balance entries.
+        index (LeaseIndex, optional): Leases listed earlier in the same
+            sync; a fresh index is used when omitted.
+
+    Returns:
+        dict: Lease ID to lease details, omitting failed lookups.
+    """
+    if index is None:
+        index = LeaseIndex()
+    wanted = list(dict.fromkeys(entry["LeaseId"] for entry in entries))
+    found = {}
+
+    def take_indexed():
+        for lease_id in wanted:
+            if lease_id not in found:
+                lease = index.pop(lease_id)
+                if lease is not None:
+                    found[lease_id] = lease
+
+    take_indexed()
+    remaining = [entry for entry in entries if entry["LeaseId"] not in found]
+    if len({entry["LeaseId"] for entry in remaining}) >= LEASE_BULK_THRESHOLD:
+        property_ids = index.claim(dict.fromkeys(
+            entry["PropertyId"] for entry in remaining if entry.get("PropertyId")
+        ))
+        if property_ids:
+            index.add(_fetch_filtered_listing(
+                "/leases", "propertyids", property_ids,
+                {"leasestatuses": list(BUILDIUM_LEASE_STATUSES)},
+            ))
+            take_indexed()
+
+    stragglers = [lease_id for lease_id in wanted if lease_id not in found]
+    with ThreadPoolExecutor(max_workers=BUILDIUM_ENRICH_WORKERS) as executor:
+        for lease_id, lease in zip(stragglers, executor.map(in_current_context(get_lease_details), stragglers)):
+            if lease:
+                found[lease_id] = lease
+    return found
+
+@timed_phase("property_enrichment")
+def get_properties_bulk(property_ids):
+    """
+    Resolve many properties at once, using the cache and the rentals listing.
+
+    Property IDs not already cached are requested through ``/rentals`` in
+    chunks of BUILDIUM_BULK_CHUNK via the ``propertyids`` filter. Any ID the
+    listing does not return falls back to ``get_property_details``, so
+    concurrent callers missing the same property share one GET.
+
+    Args:
+        property_ids (Iterable[int]): Property IDs to resolve.
+
+    Returns:
+        dict: Property ID to property details, omitting failed lookups.
+    """
+    found = {}
+    missing = []
+    for property_id in dict.fromkeys(property_ids):
+        prop = property_cache.get(property_id)
+        if prop is not None:
+            found[property_id] = prop
+        else:
+            missing.append(property_id)
+    if not missing:
+        return found
+
+    wanted = set(missing)
+    for prop in _fetch_filtered_listing("/rentals", "propertyids", missing):
+        property_id = prop.get("Id")
+        if property_id in wanted:
+            property_cache.put(property_id, prop)
+            found[property_id] = prop
+
+    stragglers = [property_id for property_id in missing if property_id not in found]
+    with ThreadPoolExecutor(max_workers=BUILDIUM_ENRICH_WORKERS) as executor:
+        for property_id, prop in zip(stragglers, executor.map(in_current_context(functools.partial(get_property_details, counted=True)), stragglers)):
+            if prop is not None:
+                found[property_id] = prop
+    return found
+
+def coalesce_updates(updates, known=None):
+    """
+    Merge single-row updates into runs of contiguous rows.
+
+    Updates are sorted by row and adjacent rows are merged into one run.
+    When ``known`` is given, gaps between updated rows are bridged with the
+    rows' current values as long as every row in the gap has a known,
+    non-empty value, so a dense change set collapses into a few long ranges.
+
+    Args:
+        updates (list): List of (row, value) tuples.
+        known (dict, optional): Row index to current value used to fill gaps.
+
+    Returns:
+        list: (start row, [values]) tuples, one per contiguous run.
+    """
+    values = dict(updates)
+    runs = []
+    for row in sorted(values):
+        if runs:
+            start, run = runs[-1]
+            last = start + len(run) - 1
+            gap = range(last + 1, row)
+            if known is not None and all(known.get(r) is not None for r in gap):
+                run.extend(known[r] for r in gap)
+                gap = ()
+            if not gap:
+                run.append(values[row])
+                continue
+        runs.append((row, [values[row]]))
+    return runs
+
+@timed_phase("write")
+def write_to_sheet(updates, balance_map=None):
     """
     Batch write outstanding balances to Google Sheet.
 
+    Contiguous rows are written as one multi-row range (e.g. ``E10:E57``).
+    When ``balance_map`` is given and the updated rows make up at least
+    SHEET_REWRITE_RATIO of the span from the first to the last updated row,
+    unchanged rows between updates are rewritten with their current values
+    so the column goes out in as few ranges as possible; the filler cells
+    then never outnumber the updates by more than that ratio allows.
+    Scattered updates are written as separate ranges. The payload is split
+    into batchUpdate calls of at most SHEETS_MAX_PAYLOAD_BYTES each.
+
     Args:
         updates (list): List of (row, value) tuples.
+        balance_map (dict, optional): Row index to current balance, as
+            returned by ``get_sheet_snapshot``.
     """
-    data = [{
-        "range": f"{SHEET_NAME}!E{row}",
-        "values": [[value]]
-    } for row, value in updates]
-    sheets.values().batchUpdate(
-        spreadsheetId=SHEET_ID,
-        body={"valueInputOption": "RAW", "data": data}
-    ).execute()
+    known = None
+    rows = {row for row, _ in updates}
+    if balance_map and rows and len(rows) / (max(rows) - min(rows) + 1) >= SHEET_REWRITE_RATIO:
+        known = balance_map
+    data = []
+    for start, run in coalesce_updates(updates, known):
+        for piece in _split_by_size(run, SHEETS_MAX_PAYLOAD_BYTES):
+            data.append({
+                "range": f"{SHEET_NAME}!E{start}:E{start + len(piece) - 1}",
+                "values": [[value] for value in piece]
+            })
+            start += len(piece)
+    for chunk in _split_by_size(data, SHEETS_MAX_PAYLOAD_BYTES):
+        execute_sheets_request(get_sheets().values().batchUpdate(
+            spreadsheetId=SHEET_ID,
+            body={"valueInputOption": "RAW", "data": chunk}
+        ), write=True)
 
+@timed_phase("append")
 def append_new_rows(rows):
     """
     Append new lease entries to the Google Sheet.
 
+    Rows are sent in order, in chunks of at most SHEETS_MAX_PAYLOAD_BYTES.
+    Only 429 responses are retried: an append that failed with a 5xx may
+    already have been applied, and retrying it could duplicate rows.
+
     Args:
         rows (list): Rows to append.
     """
     if not rows:
         return
-    sheets.values().append(
-        spreadsheetId=SHEET_ID,
-        range=f"{SHEET_NAME}!A2",
-        valueInputOption="RAW",
-        insertDataOption="INSERT_ROWS",
-        body={"values": rows}
-    ).execute()
+    for chunk in _split_by_size(rows, SHEETS_MAX_PAYLOAD_BYTES):
+        execute_sheets_request(get_sheets().values().append(
+            spreadsheetId=SHEET_ID,
+            range=f"{SHEET_NAME}!A2",
+            valueInputOption="RAW",
+            insertDataOption="INSERT_ROWS",
+            body={"values": chunk}
+        ), write=True, retry_statuses=(429,))
 
-def sync_outstanding_balances():
+def build_new_row(entry, lease, prop):
     """
-    Main sync function to update or append lease data.
+    Build a sheet row for a lease that is not on the sheet yet.
+
+    Args:
+        entry (dict): Outstanding balance entry from Buildium.
+        lease (dict): Lease details.
+        prop (dict or None): Property details, if available.
 
     Returns:
-        str: Summary of sync operation.
+        list: Row values for columns A through AA.
     """
-    lease_map = get_lease_id_map()
-    balances = get_outstanding_balances()
+    tenants = lease.get("CurrentTenants", [])
+    if tenants:
+        tenant = tenants[0]
+        tenant_name = f"{tenant.get('FirstName', '')} {tenant.get('LastName', '')}".strip()
+        phone = (tenant.get("PhoneNumbers") or [{}])[0].get("Number", "")
+    else:
+        tenant_name = ""
+        phone = ""
 
-    updates = []
-    new_rows = []
+    address = ""
+    if prop:
+        address = prop.get("Address", {}).get("AddressLine1", "")
+
+    row = [""] * 27
+    row[0] = tenant_name
+    row[1] = address
+    row[2] = phone
+    row[4] = entry["TotalBalance"]
+    row[26] = str(entry["LeaseId"])
+    return row
+
+def enrich_new_leases(entries, lease_index=None):
+    """
+    Enrich unmatched balance entries with lease and property details.
+
+    Leases are resolved in bulk, then the distinct properties they
+    reference; both stages run on pools of BUILDIUM_ENRICH_WORKERS threads
+    so Buildium rate limits are respected. Rows are returned in the order of
+    ``entries``.
+
+    Args:
+        entries (list): Outstanding balance entries not present on the sheet.
+        lease_index (LeaseIndex, optional): Per-sync index shared between
+            calls so each property's leases are listed once per run.
+
+    Returns:
+        list: New sheet rows, skipping leases that could not be resolved.
+    """
+    if not entries:
+        return []
+    leases_by_id = get_leases_bulk(entries, lease_index)
+    leases = [leases_by_id.get(entry["LeaseId"]) for entry in entries]
 
-    for entry in balances:
+    properties = get_properties_bulk(
+        lease["PropertyId"] for lease in leases if lease and lease.get("PropertyId")
+    )
+    return [
+        build_new_row(entry, lease, properties.get(lease.get("PropertyId")))
+        for entry, lease in zip(entries, leases)
+        if lease
+    ]
+
+def _incremental_mode(full):
+    """
+    Decide whether this run may skip leases recorded as unchanged.
+
+    Args:
+        full (bool): Whether a full comparison was requested.
+
+    Returns:
+        bool: True when incremental mode is on and no full sync is due.
+    """
+    return (
+        sync_state is not None
+        and not full
+        and time.time() - sync_state.watermark()["last_full_sync"] < SYNC_FULL_INTERVAL
+    )
+
+@timed_phase("diff")
+def diff_balances(entries, lease_map, balance_map):
+    """
+    Compare balance entries against a sheet snapshot.
+
+    Args:
+        entries (list): Outstanding balance entries from Buildium.
+        lease_map (dict): Lease ID to row index, from ``get_sheet_snapshot``.
+        balance_map (dict): Row index to current balance, from ``get_sheet_snapshot``.
+
+    Returns:
+        tuple: (row updates, entries not on the sheet, (lease ID, balance)
+        pairs already on the sheet once the updates are written).
+    """
+    updates = []
+    unmatched = []
+    written = []
+    for entry in entries:
         lease_id = str(entry["LeaseId"])
         balance = entry["TotalBalance"]
         matched_row = lease_map.get(lease_id)
 
         if matched_row:
-            existing = sheets.values().get(
-                spreadsheetId=SHEET_ID,
-                range=f"{SHEET_NAME}!E{matched_row}"
-            ).execute()
-            current_value = float(existing.get("values", [["0"]])[0][0])
-            if current_value != balance:
+            if (balance_map.get(matched_row) or 0.0) != balance:
                 updates.append((matched_row, balance))
+            written.append((lease_id, balance))
             continue
 
-        lease = get_lease_details(entry["LeaseId"])
-        if not lease:
-            continue
+        unmatched.append(entry)
+    return updates, unmatched, written
+
+def _flush_writes(updates, new_rows, written, balance_map):
+    """
+    Write pending updates and new rows, then record them in the state store.
+
+    Args:
+        updates (list): (row, balance) updates for existing rows.
+        new_rows (list): Rows to append.
+        written (list): (lease ID, balance) pairs already matching the sheet.
+        balance_map (dict or None): Snapshot balances, used to coalesce writes;
+            updated in place with the values written.
+    """
+    if updates:
+        write_to_sheet(updates, balance_map)
+        if balance_map is not None:
+            balance_map.update(updates)
+        print(f"✅ Updated {len(updates)} rows.")
+    if new_rows:
+        append_new_rows(new_rows)
+        print(f"➕ Appended {len(new_rows)} new rows.")
+
+    if sync_state is not None:
+        sync_state.record(written + [(row[26], row[4]) for row in new_rows])
+
+def _finish_sync(report, progress, incremental, cache_before, engine="threads"):
+    """
+    Advance the watermark, persist caches and build the sync report.
+
+    The report is also logged to stderr as a single JSON line, which Cloud
+    Run ingests as a structured log entry.
+
+    Args:
+        report (SyncReport): Timings and counters collected during the sync.
+        progress (dict): Final progress counters of the sync.
+        incremental (bool): Whether unchanged leases were skipped.
+        cache_before (dict): ``property_cache.stats()`` taken at the start.
+        engine (str, optional): Engine that ran the sync.
+
+    Returns:
+        dict: Structured sync report, including the one-line ``summary``.
+    """
+    if sync_state is not None:
+        sync_state.mark_synced(full=not incremental)
+
+    property_cache.save()
+    cache_after = property_cache.stats()
+    cache_hits = cache_after["hits"] - cache_before["hits"]
+    cache_misses = cache_after["misses"] - cache_before["misses"]
+
+    summary = f"✅ Synced {progress['updated']} updates, {progress['appended']} new rows. "
+    if incremental:
+        summary += f"Skipped {progress['skipped']} unchanged leases. "
+    summary += f"Property cache: {cache_hits} hits, {cache_misses} misses."
+
+    ROWS_UPDATED.inc(progress["updated"])
+    ROWS_APPENDED.inc(progress["appended"])
+    PROPERTY_CACHE_LOOKUPS.labels("hit").inc(cache_hits)
+    PROPERTY_CACHE_LOOKUPS.labels("miss").inc(cache_misses)
+
+    result = {
+        "summary": summary,
+        "engine": engine,
+        "incremental": incremental,
+        **progress,
+        **report.to_dict(),
+        "property_cache": {"hits": cache_hits, "misses": cache_misses},
+        "rate_limiter": {key: round(value, 3) for key, value in buildium_limiter.stats().items()},
+    }
+    LAST_SUCCESS_DURATION.set(result["duration_seconds"])
+    LAST_SUCCESS_TIMESTAMP.set(time.time())
+    print(json.dumps({"severity": "INFO", "message": summary, "sync_report": result}), file=sys.stderr)
+    return result
+
+def _init_progress(progress):
+    """
+    Reset the progress counters a sync reports while it runs.
+
+    Args:
+        progress (dict or None): Caller-owned counters, or None.
+
+    Returns:
+        dict: ``progress`` (or a fresh dict) with every counter set to 0.
+    """
+    if progress is None:
+        progress = {}
+    progress.update(pages=0, leases=0, skipped=0, updated=0, appended=0)
+    return progress
+
+def sync_outstanding_balances(full=False, progress=None):
+    """
+    Main sync function to update or append lease data.
+
+    Balance pages are streamed from ``iter_pages`` and each page is diffed
+    as soon as it arrives, while the sheet snapshot is read concurrently
+    with the first pages. Once SYNC_FLUSH_ROWS updates and new leases have
+    accumulated, the new leases are enriched together (sharing one
+    ``LeaseIndex`` for the whole run) and everything is written, so memory
+    stays at roughly one flush plus the sheet index. With SYNC_INCREMENTAL
+    enabled, leases whose balance matches what
+    the state store last recorded are skipped and the sheet is only read if
+    something changed; a full comparison still runs every
+    SYNC_FULL_INTERVAL seconds or when ``full`` is set.
+
+    Args:
+        full (bool, optional): Force a full comparison in incremental mode.
+        progress (dict, optional): Counters updated in place as the sync runs
+            (``pages``, ``leases``, ``skipped``, ``updated``, ``appended``).
+
+    Returns:
+        dict: Structured sync report (see ``_finish_sync``).
+    """
+    report = _start_report()
+    cache_before = property_cache.stats()
+    incremental = _incremental_mode(full)
+    known = sync_state.known_hashes() if incremental else None
+    progress = _init_progress(progress)
+
+    updates = []
+    written = []
+    unmatched = []
+    lease_index = LeaseIndex()
+    lease_map = None
+    balance_map = None
+    updated = 0
+    appended = 0
+    skipped = 0
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        snapshot_future = None
+        if not incremental:
+            snapshot_future = executor.submit(in_current_context(get_sheet_snapshot))
+        pages = iter_pages("/leases/outstandingbalances", phase="balances")
+
+        while True:
+            page = next(pages, None)
+            if page is None:
+                break
+            pending = sync_state.changed(page, known) if incremental else page
+            skipped += len(page) - len(pending)
+            progress["pages"] += 1
+            progress["leases"] += len(page)
+            progress["skipped"] = skipped
+            if not pending:
+                continue
+
+            if lease_map is None:
+                if snapshot_future is None:
+                    lease_map, balance_map = get_sheet_snapshot()
+                else:
+                    lease_map, balance_map = snapshot_future.result()
+            page_updates, page_unmatched, page_written = diff_balances(pending, lease_map, balance_map)
+            updates.extend(page_updates)
+            written.extend(page_written)
+            unmatched.extend(page_unmatched)
+
+            if len(updates) + len(unmatched) >= SYNC_FLUSH_ROWS:
+                new_rows = enrich_new_leases(unmatched, lease_index)
+                _flush_writes(updates, new_rows, written, balance_map)
+                updated += len(updates)
+                appended += len(new_rows)
+                progress["updated"] = updated
+                progress["appended"] = appended
+                updates, unmatched, written = [], [], []
+
+    new_rows = enrich_new_leases(unmatched, lease_index)
+    _flush_writes(updates, new_rows, written, balance_map)
+    updated += len(updates)
+    appended += len(new_rows)
+    progress["updated"] = updated
+    progress["appended"] = appended
 
-        tenants = lease.get("CurrentTenants", [])
-        if tenants:
-            tenant = tenants[0]
-            tenant_name = f"{tenant.get('FirstName', '')} {tenant.get('LastName', '')}".strip()
-            phone = tenant.get("PhoneNumbers", [{}])[0].get("Number", "")
+    return _finish_sync(report, progress, incremental, cache_before)
+
+async def _async_buildium_get(client, path, params=None):
+    """
+    Async counterpart of ``BuildiumClient.get``.
+
+    Shares ``buildium_limiter`` with the blocking client and applies the
+    same retry policy, sleeping on the event loop instead of a thread.
+
+    Args:
+        client (httpx.AsyncClient): Client configured for the Buildium API.
+        path (str): Path below the API root.
+        params (dict, optional): Query string parameters.
+
+    Returns:
+        httpx.Response: The last response received.
+    """
+    import httpx
+
+    attempt = 0
+    while True:
+        wait = buildium_limiter.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        report_count("buildium_calls")
+        try:
+            with observe_api_call("buildium", path):
+                res = await client.get(path, params=params)
+        except httpx.TransportError as e:
+            if attempt >= BUILDIUM_MAX_RETRIES:
+                raise
+            delay = _backoff_delay(attempt)
+            print(f"⚠️ Buildium {path} failed ({e}), retrying in {delay:.1f}s", file=sys.stderr)
         else:
-            tenant_name = ""
-            phone = ""
+            report_count("buildium_bytes", len(res.content))
+            if res.status_code == 429:
+                count_throttled("buildium")
+            if res.status_code not in BUILDIUM_RETRY_STATUSES or attempt >= BUILDIUM_MAX_RETRIES:
+                return res
+            delay = _backoff_delay(attempt, res.headers.get("Retry-After"))
+            print(f"⚠️ Buildium {path} returned {res.status_code}, retrying in {delay:.1f}s", file=sys.stderr)
+        count_retry("buildium")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+async def _async_fetch_page(client, path, params, offset, limit):
+    """
+    Async counterpart of ``_fetch_page``.
+
+    Returns:
+        list: Items on the page.
+    """
+    with trace_span("buildium page", path=path, offset=offset, limit=limit):
+        res = await _async_buildium_get(client, path, {**params, "limit": limit, "offset": offset})
+    if res.status_code >= 400:
+        raise BuildiumError(res, offset=offset)
+    return res.json()
+
+async def _async_iter_pages(client, path, params=None, limit=1000, phase=None):
+    """
+    Yield pages of a Buildium listing in offset order as they arrive.
+
+    Uses the same windowing as ``iter_pages``: after a full first page,
+    BUILDIUM_PAGE_CONCURRENCY offsets are requested at once, and the next
+    window is requested as soon as every page of the current one came back
+    full.
+
+    Args:
+        client (httpx.AsyncClient): Client configured for the Buildium API.
+        path (str): Listing path below the API root.
+        params (dict, optional): Extra query parameters (filters).
+        limit (int, optional): Page size.
+        phase (str, optional): Sync report phase for time spent waiting.
+
+    Yields:
+        list: Items on each page.
+    """
+    params = params or {}
+    with report_phase(phase):
+        page = await _async_fetch_page(client, path, params, 0, limit)
+    yield page
+    if len(page) < limit:
+        return
+
+    window_span = BUILDIUM_PAGE_CONCURRENCY * limit
+
+    def submit_window(start):
+        return [
+            asyncio.create_task(_async_fetch_page(client, path, params, start + i * limit, limit))
+            for i in range(BUILDIUM_PAGE_CONCURRENCY)
+        ]
+
+    def window_full(window):
+        return all(
+            t.done() and not t.cancelled() and t.exception() is None and len(t.result()) == limit
+            for t in window
+        )
+
+    offset = limit
+    window = submit_window(offset)
+    next_window = None
+    try:
+        while True:
+            next_window = None
+            for task in window:
+                with report_phase(phase):
+                    page = await task
+                if next_window is None and window_full(window):
+                    next_window = submit_window(offset + window_span)
+                yield page
+                if len(page) < limit:
+                    return
+            offset += window_span
+            window = next_window
+    finally:
+        for task in window + (next_window or []):
+            task.cancel()
+
+async def _async_get_json(client, path, span_name, **attributes):
+    """
+    GET a single Buildium resource.
+
+    Args:
+        client (httpx.AsyncClient): Client configured for the Buildium API.
+        path (str): Resource path below the API root.
+        span_name (str): Trace span name, matching the threaded engine's.
+        **attributes: Span attributes such as ``lease_id``.
 
+    Returns:
+        dict or None: Parsed body, or None if the request failed.
+    """
+    with trace_span(span_name, **attributes):
+        res = await _async_buildium_get(client, path)
+    return res.json() if res.status_code < 400 else None
+
+async def async_sync_outstanding_balances(full=False, progress=None):
+    """
+    Asyncio implementation of ``sync_outstanding_balances``.
+
+    Buildium calls go through ``httpx.AsyncClient``; blocking Sheets calls
+    run in worker threads. The sheet snapshot is read while balance pages
+    are still arriving, and later pages keep downloading while a flush is
+    enriched and written. As in the threaded engine, updates and new leases
+    are flushed every SYNC_FLUSH_ROWS. A flush with at least
+    LEASE_BULK_THRESHOLD new leases is handed to ``enrich_new_leases`` in a
+    worker thread so the bulk listings are used; smaller batches are looked
+    up one by one (at most BUILDIUM_ENRICH_WORKERS requests at a time),
+    resolving each property once per run. Selected with
+    ``SYNC_ENGINE=async``.
+
+    Args:
+        full (bool, optional): Force a full comparison in incremental mode.
+        progress (dict, optional): Counters updated in place as the sync
+            runs, as for ``sync_outstanding_balances``.
+
+    Returns:
+        dict: Structured sync report (see ``_finish_sync``).
+    """
+    import httpx
+
+    report = _start_report()
+    cache_before = property_cache.stats()
+    progress = _init_progress(progress)
+    incremental = await asyncio.to_thread(_incremental_mode, full)
+    known = await asyncio.to_thread(sync_state.known_hashes) if incremental else None
+    snapshot_task = None if incremental else asyncio.create_task(asyncio.to_thread(get_sheet_snapshot))
+
+    semaphore = asyncio.Semaphore(BUILDIUM_ENRICH_WORKERS)
+    property_tasks = {}
+    lease_index = LeaseIndex()
+
+    async def resolve_property(client, property_id):
+        prop = property_cache.get(property_id)
+        if prop is None:
+            async with semaphore:
+                prop = await _async_get_json(
+                    client, f"/rentals/{property_id}",
+                    "buildium get_property_details", property_id=property_id,
+                )
+            if prop is not None:
+                property_cache.put(property_id, prop)
+        return prop
+
+    async def enrich(client, entry):
+        lease = lease_index.pop(entry["LeaseId"])
+        if lease is None:
+            async with semaphore:
+                lease = await _async_get_json(
+                    client, f"/leases/{entry['LeaseId']}",
+                    "buildium get_lease_details", lease_id=entry["LeaseId"],
+                )
+        if not lease:
+            return None
         property_id = lease.get("PropertyId")
-        address = ""
+        prop = None
         if property_id:
-            prop = get_property_details(property_id)
-            if prop:
-                address = prop.get("Address", {}).get("AddressLine1", "")
+            if property_id not in property_tasks:
+                property_tasks[property_id] = asyncio.create_task(resolve_property(client, property_id))
+            prop = await property_tasks[property_id]
+        return build_new_row(entry, lease, prop)
 
-        row = [""] * 27
-        row[0] = tenant_name
-        row[1] = address
-        row[2] = phone
-        row[4] = balance
-        row[26] = lease_id
+    async def enrich_each(client, entries):
+        with report_phase("lease_enrichment"):
+            rows = await asyncio.gather(*(enrich(client, entry) for entry in entries))
+        return [row for row in rows if row]
 
-        new_rows.append(row)
+    async def flush(client, updates, unmatched, written, balance_map):
+        if len(unmatched) >= LEASE_BULK_THRESHOLD:
+            new_rows = await asyncio.to_thread(enrich_new_leases, unmatched, lease_index)
+        else:
+            new_rows = await enrich_each(client, unmatched)
+        await asyncio.to_thread(_flush_writes, updates, new_rows, written, balance_map)
+        return len(new_rows)
 
-    if updates:
-        write_to_sheet(updates)
-        print(f"✅ Updated {len(updates)} rows.")
-    if new_rows:
-        append_new_rows(new_rows)
-        print(f"➕ Appended {len(new_rows)} new rows.")
+    updates = []
+    written = []
+    unmatched = []
+    balance_map = None
+    skipped = 0
+    updated = 0
+    appended = 0
 
-    return f"✅ Synced {len(updates)} updates, {len(new_rows)} new rows."
+    async with httpx.AsyncClient(
+        base_url=BUILDIUM_BASE_URL,
+        headers={
+            "x-buildium-client-id": BUILD_IUM_CLIENT_ID,
+            "x-buildium-client-secret": BUILD_IUM_CLIENT_SECRET,
+            "Accept": "application/json",
+        },
+        limits=httpx.Limits(max_connections=max(BUILDIUM_PAGE_CONCURRENCY, BUILDIUM_ENRICH_WORKERS)),
+        timeout=BUILDIUM_TIMEOUT,
+    ) as client:
+        try:
+            async for page in _async_iter_pages(client, "/leases/outstandingbalances", phase="balances"):
+                pending = sync_state.changed(page, known) if incremental else page
+                skipped += len(page) - len(pending)
+                progress["pages"] += 1
+                progress["leases"] += len(page)
+                progress["skipped"] = skipped
+                if not pending:
+                    continue
+                if snapshot_task is None:
+                    snapshot_task = asyncio.create_task(asyncio.to_thread(get_sheet_snapshot))
+                lease_map, balance_map = await snapshot_task
+                page_updates, page_unmatched, page_written = diff_balances(pending, lease_map, balance_map)
+                updates.extend(page_updates)
+                written.extend(page_written)
+                unmatched.extend(page_unmatched)
 
-@app.route("/")
-def run_sync():
+                if len(updates) + len(unmatched) >= SYNC_FLUSH_ROWS:
+                    appended += await flush(client, updates, unmatched, written, balance_map)
+                    updated += len(updates)
+                    progress["updated"] = updated
+                    progress["appended"] = appended
+                    updates, unmatched, written = [], [], []
+
+            appended += await flush(client, updates, unmatched, written, balance_map)
+            updated += len(updates)
+        finally:
+            if snapshot_task is not None and not snapshot_task.done():
+                snapshot_task.cancel()
+
+    progress["updated"] = updated
+    progress["appended"] = appended
+    return await asyncio.to_thread(_finish_sync, report, progress, incremental, cache_before, "async")
+
+def run_configured_sync(full=False, progress=None):
     """
-    HTTP endpoint to trigger the sync process.
+    Run a sync with the engine selected by SYNC_ENGINE.
+
+    Args:
+        full (bool, optional): Force a full comparison in incremental mode.
+        progress (dict, optional): Counters updated in place as the sync runs.
 
     Returns:
-        Response: Sync status text and HTTP status code.
+        dict: Structured sync report (see ``_finish_sync``).
+    """
+    if SYNC_ENGINE == "async":
+        return asyncio.run(async_sync_outstanding_balances(full=full, progress=progress))
+    return sync_outstanding_balances(full=full, progress=progress)
+
+class SyncLock:
+    """
+    Cross-instance lock taken around each sync.
+
+    The base class never blocks and suits single-instance deployments.
+    Subclasses registered in ``SYNC_LOCK_BACKENDS`` provide real exclusion
+    and are selected with SYNC_LOCK_BACKEND.
+    """
+
+    def acquire(self):
+        """
+        Try to take the lock without waiting.
+
+        Returns:
+            bool: True if this process now holds the lock.
+        """
+        return True
+
+    def release(self):
+        """Release the lock if held."""
+
+class FileSyncLock(SyncLock):
+    """
+    Lock backed by ``flock`` on a local file.
+
+    Excludes other processes on the same host or sharing the same volume,
+    e.g. multiple server workers in one container. The OS drops the lock if
+    the holder dies, so a crashed sync never leaves it stuck.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Lock file location.
+        """
+        self.path = path
+        self._fd = None
+
+    def acquire(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+SYNC_LOCK_BACKENDS = {
+    "none": lambda: SyncLock(),
+    "file": lambda: FileSyncLock(SYNC_LOCK_PATH),
+}
+
+class SyncJob:
+    """
+    A sync run queued on the background worker.
+
+    Attributes:
+        id (str): Job identifier used in ``/jobs/<id>``.
+        full (bool): Whether a full comparison was requested.
+        status (str): ``queued``, ``running``, ``succeeded``, ``failed``,
+            ``skipped`` when another instance held the sync lock, or
+            ``cancelled`` when the server shut down before it started.
+        progress (dict): Counters updated by the running sync.
+        result (dict or None): Sync report once finished.
+        error (str or None): Error message once failed.
+    """
+
+    def __init__(self, full=False):
+        """
+        Args:
+            full (bool, optional): Force a full comparison in incremental mode.
+        """
+        self.id = uuid.uuid4().hex
+        self.full = full
+        self.status = "queued"
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def finished(self):
+        """
+        Returns:
+            bool: True once the job has stopped running, whatever the outcome.
+        """
+        return self.done.is_set()
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: JSON-serializable job status.
+        """
+        return {
+            "id": self.id,
+            "status": self.status,
+            "full": self.full,
+            "progress": dict(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+# Background sync worker; one job runs at a time.
+_job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sync-job")
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+_active_job = None
+sync_lock = SYNC_LOCK_BACKENDS[SYNC_LOCK_BACKEND]()
+
+def _run_job(job):
+    """
+    Execute a queued job on the background worker, recording its outcome.
+
+    The job is skipped if another instance holds ``sync_lock``.
+
+    Args:
+        job (SyncJob): Job to run.
     """
+    global _active_job
+    job.status = "running"
+    job.started_at = time.time()
     try:
-        result = sync_outstanding_balances()
-        return result, 200
+        if not sync_lock.acquire():
+            job.status = "skipped"
+            job.result = {"summary": "⏭️ Skipped: another instance is already syncing."}
+            return
+        try:
+            with trace_span("run_sync", job_id=job.id, full=job.full, engine=SYNC_ENGINE):
+                job.result = run_configured_sync(full=job.full, progress=job.progress)
+            job.status = "succeeded"
+        finally:
+            sync_lock.release()
     except Exception as e:
         import traceback
         print(" Error:", traceback.format_exc(), file=sys.stderr)
-        return f"❌ Sync failed: {e}", 500
+        job.error = str(e)
+        job.status = "failed"
+    finally:
+        job.finished_at = time.time()
+        with _jobs_lock:
+            if _active_job is job:
+                _active_job = None
+        job.done.set()
+
+def submit_sync_job(full=False):
+    """
+    Queue a sync on the background worker, or join the one in flight.
+
+    While a job is queued or running, further triggers get that same job
+    back instead of starting a duplicate sync (even if they asked for a
+    full comparison). Only the most recent SYNC_JOB_HISTORY jobs are kept
+    for status lookups.
+
+    Args:
+        full (bool, optional): Force a full comparison in incremental mode.
+
+    Returns:
+        SyncJob: The queued or in-flight job.
+    """
+    global _active_job
+    with _jobs_lock:
+        if _active_job is not None:
+            return _active_job
+        job = _active_job = SyncJob(full=full)
+        _jobs[job.id] = job
+        while len(_jobs) > SYNC_JOB_HISTORY:
+            _jobs.popitem(last=False)
+    _job_executor.submit(_run_job, job)
+    return job
+
+def shutdown_jobs(wait=True):
+    """
+    Stop the background worker, letting an in-flight sync finish.
+
+    Jobs still waiting in the queue are marked ``cancelled``. Called from
+    the server's shutdown hook so a SIGTERM does not cut a sync short.
+
+    Args:
+        wait (bool, optional): Block until the running sync has finished.
+    """
+    _job_executor.shutdown(wait=wait, cancel_futures=True)
+    with _jobs_lock:
+        queued = [job for job in _jobs.values() if job.status == "queued"]
+    for job in queued:
+        job.status = "cancelled"
+        job.finished_at = time.time()
+        job.done.set()
+
+@app.route("/")
+def run_sync():
+    """
+    HTTP endpoint to trigger the sync process.
+
+    The sync is queued on a background worker and the endpoint returns
+    202 immediately with the job id; poll ``/jobs/<id>`` for progress. If a
+    sync is already in flight, its job is returned instead of starting
+    another. ``/?wait=1`` blocks until that job finishes and returns its
+    structured sync report as JSON, or 503 with the job if the server shut
+    down before it ran.
+
+    Returns:
+        Response: Job status (or sync report) and HTTP status code.
+    """
+    job = submit_sync_job(full=request.args.get("full") == "1")
+    if request.args.get("wait") != "1":
+        return job.to_dict(), 202, {"Location": f"/jobs/{job.id}"}
+
+    job.done.wait()
+    if job.status == "failed":
+        return f"❌ Sync failed: {job.error}", 500
+    if job.status == "cancelled":
+        return job.to_dict(), 503
+    return job.result, 200
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    """
+    HTTP endpoint reporting the status of a background sync job.
+
+    Args:
+        job_id (str): Job identifier returned by ``/``.
+
+    Returns:
+        Response: Job status JSON, or 404 if the job is unknown.
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return {"error": f"unknown job {job_id}"}, 404
+    return job.to_dict(), 200
 
 @app.route("/health")
 def health():
     """Health check endpoint."""
     return "👍 Healthy", 200
 
+@app.route("/metrics")
+def metrics():
+    """Prometheus metrics endpoint."""
+    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+
 if __name__ == "__main__":
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py).
     app.run(host="0.0.0.0", port=8080)
@@ -0,0 +1,34 @@
+# Gunicorn configuration for running the sync service in production.
+#
+# Usage: gunicorn -c gunicorn.conf.py buildium_sync:app
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+# One worker keeps the in-memory job registry (/jobs/<id>) consistent.
+# Raise GUNICORN_WORKERS only together with SYNC_LOCK_BACKEND=file.
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+
+# Load the app once in the master so workers fork with it already imported.
+preload_app = True
+
+# Seconds of missed heartbeats before the master restarts a hung worker. Syncs
+# run on a background thread, so a long sync does not block the heartbeat.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+
+# Time a worker gets after SIGTERM to finish in-flight work, including a running sync.
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "300"))
+
+keepalive = 5
+accesslog = "-"
+errorlog = "-"
+
+
+def worker_exit(server, worker):
+    """Let the background sync finish before the worker process exits."""
+    from buildium_sync import shutdown_jobs
+
+    shutdown_jobs(wait=True)
@@ -0,0 +1,14 @@
+import pytest
+
+from buildium_sync import get_choice
+
+
+def test_get_choice_returns_accepted_value(monkeypatch):
+    monkeypatch.setenv("SYNC_ENGINE", "async")
+    assert get_choice("SYNC_ENGINE", "threads", ("threads", "async")) == "async"
+
+
+def test_get_choice_rejects_unknown_value(monkeypatch):
+    monkeypatch.setenv("SYNC_ENGINE", "asyncio")
+    with pytest.raises(ValueError, match="SYNC_ENGINE"):
+        get_choice("SYNC_ENGINE", "threads", ("threads", "async"))
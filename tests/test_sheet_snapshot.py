@@ -0,0 +1,37 @@
+import buildium_sync
+from buildium_sync import get_sheet_snapshot
+
+
+class FakeRequest:
+    def __init__(self, result):
+        self.result = result
+
+
+class FakeValues:
+    def __init__(self, result):
+        self.result = result
+
+    def batchGet(self, **kwargs):
+        return FakeRequest(self.result)
+
+
+class FakeSpreadsheets:
+    def __init__(self, result):
+        self.result = result
+
+    def values(self):
+        return FakeValues(self.result)
+
+
+def test_snapshot_treats_non_numeric_balances_as_unknown(monkeypatch):
+    result = {"valueRanges": [
+        {"values": [[10.5], ["Paid"], ["#REF!"], [], [3]]},
+        {"values": [["101"], ["102"], ["103"], ["104"], ["105"]]},
+    ]}
+    monkeypatch.setattr(buildium_sync, "get_sheets", lambda: FakeSpreadsheets(result))
+    monkeypatch.setattr(buildium_sync, "execute_sheets_request", lambda req, **kwargs: req.result)
+
+    lease_map, balance_map = get_sheet_snapshot()
+
+    assert lease_map == {"101": 2, "102": 3, "103": 4, "104": 5, "105": 6}
+    assert balance_map == {2: 10.5, 3: None, 4: None, 5: None, 6: 3.0}
@@ -0,0 +1,18 @@
+import importlib.util
+import os
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "startup_importtime.py")
+spec = importlib.util.spec_from_file_location("startup_importtime", BENCHMARK)
+startup_importtime = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(startup_importtime)
+
+
+def test_import_stays_within_budget():
+    runs = [startup_importtime.measure_import() for _ in range(3)]
+    best_ms = min(startup_importtime.import_time_ms(run) for run in runs)
+    assert best_ms <= startup_importtime.DEFAULT_BUDGET_MS
+
+
+def test_lazy_modules_are_not_imported_at_startup():
+    assert startup_importtime.eager_imports(startup_importtime.measure_import()) == []
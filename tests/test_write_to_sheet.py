@@ -0,0 +1,68 @@
+import buildium_sync
+from buildium_sync import coalesce_updates, write_to_sheet
+
+
+class FakeValues:
+    def batchUpdate(self, spreadsheetId, body):
+        return body
+
+
+class FakeSpreadsheets:
+    def values(self):
+        return FakeValues()
+
+
+def capture_writes(monkeypatch):
+    """Replace the Sheets client and return the list batchUpdate bodies land in."""
+    bodies = []
+    monkeypatch.setattr(buildium_sync, "get_sheets", lambda: FakeSpreadsheets())
+    monkeypatch.setattr(buildium_sync, "execute_sheets_request", lambda req, **kwargs: bodies.append(req))
+    return bodies
+
+
+def written_cells(bodies):
+    return {
+        item["range"]: [value for (value,) in item["values"]]
+        for body in bodies
+        for item in body["data"]
+    }
+
+
+def test_coalesce_merges_adjacent_rows_only():
+    assert coalesce_updates([(5, 1.0), (2, 2.0), (3, 3.0), (9, 4.0)]) == [
+        (2, [2.0, 3.0]),
+        (5, [1.0]),
+        (9, [4.0]),
+    ]
+
+
+def test_coalesce_bridges_gaps_with_known_values():
+    known = {row: float(row) for row in range(2, 10)}
+    assert coalesce_updates([(2, 0.5), (5, 0.5)], known) == [(2, [0.5, 3.0, 4.0, 0.5])]
+
+
+def test_coalesce_does_not_bridge_unknown_cells():
+    known = {2: 2.0, 3: None, 4: 4.0}
+    assert coalesce_updates([(2, 0.5), (5, 0.5)], known) == [(2, [0.5]), (5, [0.5])]
+
+
+def test_scattered_updates_are_written_as_single_cells(monkeypatch):
+    bodies = capture_writes(monkeypatch)
+    balance_map = {row: 1.0 for row in range(2, 8002)}
+
+    write_to_sheet([(2, 5.0), (4000, 6.0), (8001, 7.0)], balance_map)
+
+    assert written_cells(bodies) == {
+        "Sheet1!E2:E2": [5.0],
+        "Sheet1!E4000:E4000": [6.0],
+        "Sheet1!E8001:E8001": [7.0],
+    }
+
+
+def test_dense_updates_rewrite_the_gaps(monkeypatch):
+    bodies = capture_writes(monkeypatch)
+    balance_map = {row: 1.0 for row in range(2, 100)}
+
+    write_to_sheet([(2, 5.0), (3, 5.0), (5, 5.0), (6, 5.0)], balance_map)
+
+    assert written_cells(bodies) == {"Sheet1!E2:E6": [5.0, 5.0, 1.0, 5.0, 5.0]}